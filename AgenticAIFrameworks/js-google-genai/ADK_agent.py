@@ -1,6 +1,8 @@
 from google.adk.agents.llm_agent import Agent
 
-def respondWhereAmI() -> dict:
+# ADK awaits async tools on its event loop; a plain `def` tool would be called
+# synchronously there and block every other session until it returns.
+async def respondWhereAmI() -> dict:
     """Returns the response when a user says Where am I?"""
     return {"status": "success", "answer": "DevFest Armenia"}
 
@@ -5,28 +5,18 @@ This agent generates spontaneous full-day itineraries based on mood, interests,
 It uses Google Search to find real-time information about activities, venues, and operating hours.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import google_search
+from workshop_runtime import get_settings
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
-
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
 # Create the Day Trip Genie Agent
 root_agent = Agent(
     name="day_trip_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Agent specialized in generating spontaneous full-day itineraries based on mood, interests, and budget.",
     instruction="""
     You are the "Spontaneous Day Trip" Generator 🚗 - a specialized AI assistant that creates engaging full-day itineraries.
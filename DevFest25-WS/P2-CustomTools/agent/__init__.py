@@ -1,2 +1,2 @@
-from .agent import root_agent
+from .agent import root_agent, warmup
 
@@ -5,24 +5,24 @@ This agent demonstrates how to create custom tools by connecting to external API
 It uses a real-time weather API to check conditions before making trip recommendations.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
-import requests
 from google.adk.agents import Agent
-from .constants import LOCATION_COORDINATES, MOCK_WEATHER
+from workshop_runtime import get_settings, offload
+from .gazetteer import load_gazetteer
+from .nws import CircuitBreaker, NwsClient
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# US forecasts come from the NWS API behind a circuit breaker; when it is slow or down
+# the last known good forecast is served immediately (see nws.py)
+nws = NwsClient(
+    timeout_seconds=settings.http_timeout_seconds,
+    breaker=CircuitBreaker(settings.breaker_failures, settings.breaker_cooldown_seconds, settings.upstream_slo_seconds),
+    fresh_seconds=settings.weather_fresh_seconds,
+    cache_size=settings.weather_cache_size,
+    refresh_interval_seconds=settings.weather_refresh_seconds,
+)
 
 # --- Custom Tool: Weather API Integration ---
 
@@ -40,58 +40,31 @@ def get_live_weather_forecast(location: str) -> dict:
     """
     print(f"🛠️ TOOL CALLED: get_live_weather_forecast(location='{location}')")
     
-    # Find the location in our database
-    normalized_location = location.lower()
-    location_data = None
-    location_key = None
-    
-    for key, val in LOCATION_COORDINATES.items():
-        if key in normalized_location:
-            location_data = val
-            location_key = key
-            break
+    # Find the location in our gazetteer (memory-mapped, shared across workers)
+    place = load_gazetteer().lookup(location)
     
-    if not location_data:
+    if not place:
         return {"status": "error", "message": f"I don't have weather data for {location}. Try: Munich, Bavaria, Rio de Janeiro, or US cities."}
     
     # For international locations (mock data for demo purposes)
-    if location_data["mock"] if "mock" in location_data else False:
-        weather = MOCK_WEATHER[location_key] if location_key in MOCK_WEATHER else None
-        if weather:
+    if not place.nws:
+        if place.forecast:
             return {
                 "status": "success",
-                "temperature": f"{weather['temp']}°{weather['unit']}",
-                "forecast": weather['forecast'],
+                "temperature": f"{place.temp}°{place.unit}",
+                "forecast": place.forecast,
                 "note": "Demo weather data for workshop"
             }
         return {"status": "error", "message": f"No weather data available for {location}"}
     
-    # For US locations, use real NWS API
-    try:
-        coords_str = location_data["coords"]
-        points_url = f"https://api.weather.gov/points/{coords_str}"
-        headers = {"User-Agent": "ADK Workshop Agent"}
-        points_response = requests.get(points_url, headers=headers)
-        points_response.raise_for_status()
-        forecast_url = points_response.json()['properties']['forecast']
-        
-        forecast_response = requests.get(forecast_url, headers=headers)
-        forecast_response.raise_for_status()
-        
-        current_period = forecast_response.json()['properties']['periods'][0]
-        return {
-            "status": "success",
-            "temperature": f"{current_period['temperature']}°{current_period['temperatureUnit']}",
-            "forecast": current_period['detailedForecast']
-        }
-    except requests.exceptions.RequestException as e:
-        return {"status": "error", "message": f"API request failed: {e}"}
+    # For US locations, use real NWS API (cached, with a circuit breaker)
+    return nws.forecast(place.coords)
 
 # --- Create the Weather-Aware Trip Planner Agent ---
 
 root_agent = Agent(
     name="weather_aware_planner",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="A trip planner that checks the real-time weather before making suggestions.",
     instruction="""
     You are a cautious trip planner. Before suggesting any outdoor activities, you MUST use the 
@@ -101,6 +74,15 @@ root_agent = Agent(
     Always be specific about weather conditions and how they affect the activities you suggest.
     If the weather is bad, suggest indoor alternatives.
     """,
-    tools=[get_live_weather_forecast]
+    # The NWS call blocks on the network, so run it in the shared tool thread pool
+    # instead of on ADK's event loop (which would stall every other session).
+    tools=[offload(get_live_weather_forecast, max_concurrency=settings.tool_max_concurrency)]
 )
 
+# --- Warm-up ---
+# Called by the container's startup phase (workshop_runtime.warmup) before it reports ready
+
+def warmup():
+    """Maps the gazetteer and opens the weather service connection ahead of the first request."""
+    load_gazetteer().lookup("Munich")
+    nws.warm()
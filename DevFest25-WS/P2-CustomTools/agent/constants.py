@@ -1,87 +1,73 @@
 """
 Constants for the Weather-Aware Trip Planner Agent
 
-This module contains location data and mock weather responses used by the agent.
+This module is the seed table for the gazetteer data file in `agent/data/gazetteer/`.
+The agent never reads it at runtime: edit it (or pass a CSV to the build script) and
+regenerate the data file with:
+
+    python scripts/build_gazetteer.py
+
+Each place is listed once. Names are matched case- and accent-insensitively, so
+"Königsee" also answers to "konigsee"; extra spellings go in `aliases`.
 """
 
-# Location coordinates lookup
-# Note: NWS API only works for US locations. For international locations, we return mock data.
-LOCATION_COORDINATES = {
+# Note: NWS API only works for US locations ("nws": True). For international
+# locations, we return the mock weather stored alongside the place.
+PLACES = [
     # Germany - Bavaria region (mock data for demo)
-    "munich": {"lat": 48.1351, "lon": 11.5820, "mock": True},
-    "bavaria": {"lat": 48.7904, "lon": 11.4979, "mock": True},
-    "königsee": {"lat": 47.5947, "lon": 12.9755, "mock": True},
-    "konigsee": {"lat": 47.5947, "lon": 12.9755, "mock": True},
-    "neuschwanstein": {"lat": 47.5576, "lon": 10.7498, "mock": True},
-    "berlin": {"lat": 52.5200, "lon": 13.4050, "mock": True},
-    "nuremberg": {"lat": 49.4521, "lon": 11.0767, "mock": True},
-    # Brazil (mock data for demo)
-    "rio de janeiro": {"lat": -22.9068, "lon": -43.1729, "mock": True},
-    "rio": {"lat": -22.9068, "lon": -43.1729, "mock": True},
-    "copacabana": {"lat": -22.9711, "lon": -43.1822, "mock": True},
-    "ipanema": {"lat": -22.9838, "lon": -43.2096, "mock": True},
-    # US locations (work with real NWS API)
-    "sunnyvale": {"coords": "37.3688,-122.0363", "mock": False},
-    "san francisco": {"coords": "37.7749,-122.4194", "mock": False},
-    "lake tahoe": {"coords": "39.0968,-120.0324", "mock": False},
-}
-
-# Mock weather responses for international locations
-MOCK_WEATHER = {
-    "munich": {
-        "temp": 18,
-        "unit": "C",
-        "forecast": "Partly cloudy with a chance of afternoon showers. Perfect weather for exploring the city's beer gardens!"
+    {
+        "name": "Munich",
+        "aliases": ["münchen"],
+        "lat": 48.1351, "lon": 11.5820,
+        "weather": (18, "C", "Partly cloudy with a chance of afternoon showers. Perfect weather for exploring the city's beer gardens!"),
     },
-    "bavaria": {
-        "temp": 16,
-        "unit": "C",
-        "forecast": "Clear skies and mild temperatures. Excellent conditions for mountain hiking in the Alps."
+    {
+        "name": "Bavaria",
+        "aliases": ["bayern"],
+        "lat": 48.7904, "lon": 11.4979,
+        "weather": (16, "C", "Clear skies and mild temperatures. Excellent conditions for mountain hiking in the Alps."),
     },
-    "königsee": {
-        "temp": 14,
-        "unit": "C",
-        "forecast": "Cool and clear. Ideal for boat tours on the lake with stunning mountain views."
+    {
+        "name": "Königsee",
+        "aliases": ["königssee"],
+        "lat": 47.5947, "lon": 12.9755,
+        "weather": (14, "C", "Cool and clear. Ideal for boat tours on the lake with stunning mountain views."),
     },
-    "konigsee": {
-        "temp": 14,
-        "unit": "C",
-        "forecast": "Cool and clear. Ideal for boat tours on the lake with stunning mountain views."
+    {
+        "name": "Neuschwanstein",
+        "lat": 47.5576, "lon": 10.7498,
+        "weather": (12, "C", "Crisp mountain air with excellent visibility for castle tours."),
     },
-    "neuschwanstein": {
-        "temp": 12,
-        "unit": "C",
-        "forecast": "Crisp mountain air with excellent visibility for castle tours."
+    {
+        "name": "Berlin",
+        "lat": 52.5200, "lon": 13.4050,
+        "weather": (17, "C", "Mild and breezy. Great weather for exploring museums and outdoor attractions."),
     },
-    "berlin": {
-        "temp": 17,
-        "unit": "C",
-        "forecast": "Mild and breezy. Great weather for exploring museums and outdoor attractions."
+    {
+        "name": "Nuremberg",
+        "aliases": ["nürnberg"],
+        "lat": 49.4521, "lon": 11.0767,
+        "weather": (16, "C", "Pleasant conditions for walking the historic old town."),
     },
-    "nuremberg": {
-        "temp": 16,
-        "unit": "C",
-        "forecast": "Pleasant conditions for walking the historic old town."
-    },
-    "rio de janeiro": {
-        "temp": 28,
-        "unit": "C",
-        "forecast": "Sunny and hot with occasional sea breeze. Perfect beach weather!"
-    },
-    "rio": {
-        "temp": 28,
-        "unit": "C",
-        "forecast": "Sunny and hot with occasional sea breeze. Perfect beach weather!"
+    # Brazil (mock data for demo)
+    {
+        "name": "Rio de Janeiro",
+        "aliases": ["rio"],
+        "lat": -22.9068, "lon": -43.1729,
+        "weather": (28, "C", "Sunny and hot with occasional sea breeze. Perfect beach weather!"),
     },
-    "copacabana": {
-        "temp": 29,
-        "unit": "C",
-        "forecast": "Hot and sunny. Ideal for beach activities and swimming."
+    {
+        "name": "Copacabana",
+        "lat": -22.9711, "lon": -43.1822,
+        "weather": (29, "C", "Hot and sunny. Ideal for beach activities and swimming."),
     },
-    "ipanema": {
-        "temp": 28,
-        "unit": "C",
-        "forecast": "Beautiful beach weather with light ocean breeze."
+    {
+        "name": "Ipanema",
+        "lat": -22.9838, "lon": -43.2096,
+        "weather": (28, "C", "Beautiful beach weather with light ocean breeze."),
     },
-}
-
+    # US locations (work with real NWS API)
+    {"name": "Sunnyvale", "lat": 37.3688, "lon": -122.0363, "nws": True},
+    {"name": "San Francisco", "lat": 37.7749, "lon": -122.4194, "nws": True},
+    {"name": "Lake Tahoe", "lat": 39.0968, "lon": -120.0324, "nws": True},
+]
@@ -0,0 +1,267 @@
+"""
+Gazetteer: a compact, columnar place + mock-weather store for the weather tool.
+
+The data lives in a directory of `.npy` columns and UTF-8 blobs generated by
+`scripts/build_gazetteer.py`. Everything is opened with `mmap`, so loading is a
+handful of `open()` calls regardless of how many places there are, and several
+worker processes reading the same files share the page cache instead of each
+parsing and allocating their own copy.
+
+Layout of the data directory:
+
+    meta.json           format version, counts and column widths
+    alias_keys.npy      S<w>    folded aliases, sorted (binary-searched)
+    alias_place.npy     int32   place row for each alias
+    lat.npy, lon.npy    float32 coordinates per place
+    nws.npy             bool    True if the place is served by the NWS API
+    temp.npy            int16   mock temperature per place
+    unit.npy            S1      mock temperature unit per place
+    forecast_id.npy     int32   interned forecast string per place (-1 = none)
+    names.bin + name_offsets.npy          display names (UTF-8 blob + offsets)
+    forecasts.bin + forecast_offsets.npy  interned forecasts (UTF-8 blob + offsets)
+
+This module only depends on NumPy and the standard library so the build script
+can load it without importing the agent (and therefore ADK).
+"""
+
+import json
+import mmap
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+FORMAT_VERSION = 2
+DEFAULT_DATA_DIR = Path(__file__).parent / "data" / "gazetteer"
+
+_NON_WORD = re.compile(r"[\W_]+")
+# Scripts written without spaces between words (Han, kana): every character is
+# its own word, so "東京" is found inside "東京の天気".
+_UNSPACED = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff])")
+
+
+def fold(text: str) -> str:
+    """Folds a place name for matching: lowercase, no accents, single spaces.
+
+    Letters and digits of every script are kept ("Москва" -> "москва").
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD.sub(" ", _UNSPACED.sub(r" \1 ", stripped)).split())
+
+
+@dataclass(frozen=True)
+class Place:
+    """A single gazetteer row, decoded for the caller."""
+    name: str
+    lat: float
+    lon: float
+    nws: bool
+    temp: int | None = None
+    unit: str | None = None
+    forecast: str | None = None
+
+    @property
+    def coords(self) -> str:
+        """Coordinates in the `lat,lon` form expected by the NWS points API."""
+        return f"{self.lat:.4f},{self.lon:.4f}"
+
+
+class _Blob:
+    """Read-only view of a UTF-8 string table (blob + offsets)."""
+
+    def __init__(self, blob_path: Path, offsets_path: Path):
+        self._offsets = np.load(offsets_path, mmap_mode="r")
+        with open(blob_path, "rb") as f:
+            # mmap cannot map an empty file; an empty table never gets indexed.
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if blob_path.stat().st_size else b""
+
+    def __getitem__(self, i: int) -> str:
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._data[start:end].decode("utf-8")
+
+
+class Gazetteer:
+    """Memory-mapped place index with vectorized alias lookups."""
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR):
+        data_dir = Path(data_dir)
+        self.meta = json.loads((data_dir / "meta.json").read_text())
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Gazetteer at {data_dir} has format version {self.meta['version']}, "
+                f"expected {FORMAT_VERSION}. Re-run scripts/build_gazetteer.py."
+            )
+
+        def column(name):
+            return np.load(data_dir / f"{name}.npy", mmap_mode="r")
+
+        self._alias_keys = column("alias_keys")
+        self._alias_place = column("alias_place")
+        self._lat = column("lat")
+        self._lon = column("lon")
+        self._nws = column("nws")
+        self._temp = column("temp")
+        self._unit = column("unit")
+        self._forecast_id = column("forecast_id")
+        self._names = _Blob(data_dir / "names.bin", data_dir / "name_offsets.npy")
+        self._forecasts = _Blob(data_dir / "forecasts.bin", data_dir / "forecast_offsets.npy")
+        self._max_alias_words = self.meta["max_alias_words"]
+
+    def __len__(self) -> int:
+        return len(self._lat)
+
+    def place(self, row: int) -> Place:
+        """Decodes one row of the columnar store into a `Place`."""
+        forecast_id = int(self._forecast_id[row])
+        if forecast_id < 0:
+            temp = unit = forecast = None
+        else:
+            temp = int(self._temp[row])
+            unit = self._unit[row].decode("ascii")
+            forecast = self._forecasts[forecast_id]
+        return Place(
+            name=self._names[row],
+            lat=float(self._lat[row]),
+            lon=float(self._lon[row]),
+            nws=bool(self._nws[row]),
+            temp=temp,
+            unit=unit,
+            forecast=forecast,
+        )
+
+    def lookup(self, query: str) -> Place | None:
+        """Finds the place mentioned in free text such as "Munich, Germany".
+
+        Every run of up to `max_alias_words` consecutive words in the folded query
+        is a candidate alias. All candidates are resolved with one vectorized
+        binary search; the longest match wins, then the earliest in the query.
+        """
+        words = fold(query).split()
+        if not words:
+            return None
+
+        candidates = []
+        for size in range(min(self._max_alias_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                candidates.append(" ".join(words[start:start + size]).encode("utf-8"))
+
+        # Candidates wider than the widest alias cannot match; dropping them also
+        # keeps NumPy from silently truncating them into a false positive.
+        width = self._alias_keys.dtype.itemsize
+        candidates = [c for c in candidates if len(c) <= width]
+        if not candidates:
+            return None
+
+        keys = np.array(candidates, dtype=self._alias_keys.dtype)
+        positions = np.searchsorted(self._alias_keys, keys)
+        positions[positions == len(self._alias_keys)] = 0
+        hits = np.flatnonzero(self._alias_keys[positions] == keys)
+        if not len(hits):
+            return None
+        # Candidates were generated longest-first, left-to-right.
+        return self.place(int(self._alias_place[positions[hits[0]]]))
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(data_dir: Path = DEFAULT_DATA_DIR) -> Gazetteer:
+    """Opens (once per process) the gazetteer at `data_dir`."""
+    return Gazetteer(data_dir)
+
+
+def _alias_rows(places):
+    """Maps folded aliases to place rows (first place listed wins).
+
+    Also returns the names of places that got no alias key at all (unreachable
+    by `lookup`) and the aliases dropped because an earlier place already had
+    them, as (alias, kept place, dropped place).
+    """
+    aliases, unkeyed, collisions = {}, [], []
+    for row, place in enumerate(places):
+        keyed = False
+        for alias in [place["name"], *place.get("aliases", [])]:
+            key = fold(alias)
+            if not key:
+                continue
+            keyed = True
+            kept = aliases.setdefault(key, row)
+            if kept != row:
+                collisions.append((alias, places[kept]["name"], place["name"]))
+        if not keyed:
+            unkeyed.append(place["name"])
+    return aliases, unkeyed, collisions
+
+
+def check_aliases(places) -> dict:
+    """Reports places `write_gazetteer` cannot make reachable by every alias."""
+    _, unkeyed, collisions = _alias_rows(places)
+    return {"unkeyed": unkeyed, "collisions": collisions}
+
+
+def write_gazetteer(places, data_dir: Path = DEFAULT_DATA_DIR) -> dict:
+    """Writes `places` (dicts shaped like `constants.PLACES`) as a gazetteer.
+
+    Returns the metadata that was written to `meta.json`.
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    n = len(places)
+    lat = np.empty(n, dtype=np.float32)
+    lon = np.empty(n, dtype=np.float32)
+    nws = np.zeros(n, dtype=np.bool_)
+    temp = np.zeros(n, dtype=np.int16)
+    unit = np.full(n, b"", dtype="S1")
+    forecast_id = np.full(n, -1, dtype=np.int32)
+
+    names = []
+    forecasts = {}  # forecast text -> interned id
+    aliases, _, _ = _alias_rows(places)  # folded alias -> place row
+
+    for row, place in enumerate(places):
+        names.append(place["name"])
+        lat[row] = place["lat"]
+        lon[row] = place["lon"]
+        nws[row] = bool(place.get("nws", False))
+        if place.get("weather"):
+            place_temp, place_unit, place_forecast = place["weather"]
+            temp[row] = place_temp
+            unit[row] = place_unit.encode("ascii")
+            forecast_id[row] = forecasts.setdefault(place_forecast, len(forecasts))
+
+    alias_keys = sorted(aliases)
+    encoded_keys = [key.encode("utf-8") for key in alias_keys]
+    width = max((len(key) for key in encoded_keys), default=1)
+
+    np.save(data_dir / "alias_keys.npy", np.array(encoded_keys, dtype=f"S{width}"))
+    np.save(data_dir / "alias_place.npy", np.array([aliases[key] for key in alias_keys], dtype=np.int32))
+    np.save(data_dir / "lat.npy", lat)
+    np.save(data_dir / "lon.npy", lon)
+    np.save(data_dir / "nws.npy", nws)
+    np.save(data_dir / "temp.npy", temp)
+    np.save(data_dir / "unit.npy", unit)
+    np.save(data_dir / "forecast_id.npy", forecast_id)
+    _write_blob(names, data_dir / "names.bin", data_dir / "name_offsets.npy")
+    _write_blob(list(forecasts), data_dir / "forecasts.bin", data_dir / "forecast_offsets.npy")
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "places": n,
+        "aliases": len(alias_keys),
+        "forecasts": len(forecasts),
+        "alias_width": width,
+        "max_alias_words": max((len(key.split()) for key in alias_keys), default=1),
+    }
+    (data_dir / "meta.json").write_text(json.dumps(meta, indent=2) + "\n")
+    return meta
+
+
+def _write_blob(strings, blob_path: Path, offsets_path: Path):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob_path.write_bytes(b"".join(encoded))
+    np.save(offsets_path, offsets)
@@ -0,0 +1,230 @@
+"""
+National Weather Service client with a circuit breaker and stale-while-revalidate.
+
+Without protection, every US forecast lookup waits on api.weather.gov; when the
+service is slow or down each call blocks until the timeout and then fails. This
+client keeps the last good forecast per location and puts a circuit breaker in
+front of the upstream:
+
+- closed:    calls go upstream. Errors and responses slower than the latency SLO
+             count as failures; enough consecutive failures open the breaker.
+- open:      no upstream calls. The last known good forecast is served at once
+             with a staleness note (or a quick error if there is none).
+- half-open: after the cooldown, one call probes the upstream; success closes
+             the breaker, failure opens it again.
+
+Stale-while-revalidate: a location that was fetched before is always answered
+from the cache at once. When its forecast is stale, a background thread fetches
+a new one for the next caller; only a location never seen before waits on the
+upstream. The same thread also refreshes recently *read* locations before they
+go stale, so hot entries are usually fresh, and locations nobody has asked about
+for a freshness window stop being polled.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import requests
+
+USER_AGENT = "ADK Workshop Agent"
+
+
+@dataclass
+class _Entry:
+    """A cached forecast and when it was fetched and last read (epoch seconds)."""
+    forecast: dict
+    fetched_at: float
+    read_at: float
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a latency SLO. Thread-safe."""
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float, latency_slo_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.latency_slo_seconds = latency_slo_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (claims the probe when half-open)."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self.state = "half_open"
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok: bool, latency_seconds: float = 0.0):
+        """Reports the outcome of an upstream call."""
+        ok = ok and latency_seconds <= self.latency_slo_seconds
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.state = "closed"
+                self._failures = 0
+                return
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class NwsClient:
+    """Fetches NWS forecasts by `lat,lon`, serving cached ones when stale or degraded."""
+
+    def __init__(self, timeout_seconds: float, breaker: CircuitBreaker, fresh_seconds: float,
+                 cache_size: int, refresh_interval_seconds: float, hot_entries: int = 8):
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker
+        self.fresh_seconds = fresh_seconds
+        self.cache_size = cache_size
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.hot_entries = hot_entries
+        self._cache = OrderedDict()  # coords -> _Entry, most recently read last
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        self._revalidate = queue.Queue()
+        self._queued = set()  # coords waiting in _revalidate
+        self._refresher = None
+
+    def _fetch(self, coords: str) -> dict:
+        points = self._session.get(f"https://api.weather.gov/points/{coords}", timeout=self.timeout_seconds)
+        points.raise_for_status()
+        forecast = self._session.get(points.json()["properties"]["forecast"], timeout=self.timeout_seconds)
+        forecast.raise_for_status()
+        current_period = forecast.json()["properties"]["periods"][0]
+        return {
+            "temperature": f"{current_period['temperature']}°{current_period['temperatureUnit']}",
+            "forecast": current_period["detailedForecast"],
+        }
+
+    def _read(self, coords: str):
+        with self._lock:
+            entry = self._cache.get(coords)
+            if entry:
+                entry.read_at = time.time()
+                self._cache.move_to_end(coords)
+            return entry
+
+    def _store(self, coords: str, forecast: dict):
+        with self._lock:
+            entry = self._cache.get(coords)
+            if entry:
+                # A refresh keeps the entry's place: only reads make an entry recent.
+                entry.forecast, entry.fetched_at = forecast, time.time()
+                return
+            self._cache[coords] = _Entry(forecast, time.time(), time.time())
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _upstream(self, coords: str) -> dict:
+        started = time.monotonic()
+        try:
+            forecast = self._fetch(coords)
+        except Exception:
+            # Any failure, including a malformed payload, must settle a half-open probe.
+            self.breaker.record(False)
+            raise
+        self.breaker.record(True, time.monotonic() - started)
+        self._store(coords, forecast)
+        return forecast
+
+    def forecast(self, coords: str) -> dict:
+        """Returns `{"status": "success", ...}` (possibly stale, with a note) or an error dict.
+
+        Only a location with no cached forecast waits on the upstream. A stale one
+        is answered from the cache at once while a background refresh is queued.
+        """
+        self._ensure_refresher()
+        entry = self._read(coords)
+        if entry:
+            age = time.time() - entry.fetched_at
+            if age < self.fresh_seconds:
+                return {"status": "success", **entry.forecast}
+            self._queue_refresh(coords)
+            stale = {"status": "success", **entry.forecast}
+            if self.breaker.state != "closed":
+                stale["note"] = f"The live weather service is unavailable; this forecast is from {int(age // 60)} minute(s) ago."
+            elif age >= 2 * self.fresh_seconds:
+                stale["note"] = f"This forecast is from {int(age // 60)} minute(s) ago; a newer one is being fetched."
+            return stale
+
+        error = "weather service circuit is open"
+        if self.breaker.allow():
+            try:
+                return {"status": "success", **self._upstream(coords)}
+            except Exception as e:
+                error = f"API request failed: {e}"
+        return {"status": "error", "message": f"Weather service temporarily unavailable ({error}). Please try again shortly."}
+
+    def warm(self):
+        """Starts the refresher and opens the pooled HTTPS connection before the first call."""
+        self._ensure_refresher()
+        try:
+            self._session.head("https://api.weather.gov/", timeout=self.timeout_seconds)
+        except requests.exceptions.RequestException:
+            pass  # real calls go through the breaker and cache as usual
+
+    def _queue_refresh(self, coords: str):
+        with self._lock:
+            if coords in self._queued:
+                return
+            self._queued.add(coords)
+        self._revalidate.put(coords)
+
+    def _ensure_refresher(self):
+        if self._refresher is None:
+            with self._lock:
+                if self._refresher is None:
+                    self._refresher = threading.Thread(target=self._refresh_loop, name="nws-refresh", daemon=True)
+                    self._refresher.start()
+
+    def _refresh(self, coords: str) -> bool:
+        """One background upstream call; False if the breaker or the upstream said no."""
+        if not self.breaker.allow():
+            return False
+        try:
+            self._upstream(coords)
+            return True
+        except Exception:
+            return False  # the breaker has recorded it; the refresher must keep running
+
+    def _refresh_loop(self):
+        # One upstream call at a time: revalidations requested by readers first, then,
+        # every refresh interval, the recently read entries that are about to go stale.
+        next_sweep = time.monotonic() + self.refresh_interval_seconds
+        while True:
+            try:
+                coords = self._revalidate.get(timeout=max(0.0, next_sweep - time.monotonic()))
+            except queue.Empty:
+                coords = None
+            if coords is not None:
+                with self._lock:
+                    self._queued.discard(coords)
+                self._refresh(coords)
+                continue
+
+            next_sweep = time.monotonic() + self.refresh_interval_seconds
+            now = time.time()
+            with self._lock:
+                hot = [
+                    coords for coords, entry in list(self._cache.items())[-self.hot_entries:]
+                    # read within the last freshness window, and stale before the next sweep
+                    if now - entry.read_at < self.fresh_seconds
+                    and now - entry.fetched_at >= self.fresh_seconds - self.refresh_interval_seconds
+                ]
+            for coords in hot:
+                if not self._refresh(coords):
+                    break
@@ -0,0 +1,77 @@
+"""
+Builds the gazetteer data file used by the weather tool.
+
+Usage (from the P2-CustomTools directory):
+
+    python scripts/build_gazetteer.py                    # seed places from agent/constants.py
+    python scripts/build_gazetteer.py --csv places.csv   # seed places + a larger CSV
+
+The CSV needs a header with: name, lat, lon and optionally aliases (separated by "|"),
+nws (true/false), temp, unit, forecast. Rows with a forecast get mock weather.
+
+The build fails if a place has no name or alias that can be matched, and lists
+aliases dropped because an earlier place already uses them ("Springfield");
+add a more specific alias ("Springfield, Illinois") to reach the later place.
+Pass --strict to fail on those as well.
+"""
+
+import argparse
+import csv
+import importlib.util
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).parent.parent / "agent"
+
+
+def _load_module(name):
+    # Load by path so building the data file does not import the agent (and ADK).
+    spec = importlib.util.spec_from_file_location(name, AGENT_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_csv(path):
+    places = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            place = {
+                "name": row["name"],
+                "aliases": [a for a in (row.get("aliases") or "").split("|") if a],
+                "lat": float(row["lat"]),
+                "lon": float(row["lon"]),
+                "nws": (row.get("nws") or "").strip().lower() in ("1", "true", "yes"),
+            }
+            if row.get("forecast"):
+                place["weather"] = (int(row["temp"]), row.get("unit") or "C", row["forecast"])
+            places.append(place)
+    return places
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--csv", type=Path, action="append", default=[], help="extra places to include")
+    parser.add_argument("--out", type=Path, help="output directory (default: agent/data/gazetteer)")
+    parser.add_argument("--strict", action="store_true", help="fail when aliases collide")
+    args = parser.parse_args()
+
+    gazetteer = _load_module("gazetteer")
+    places = list(_load_module("constants").PLACES)
+    for path in args.csv:
+        places.extend(read_csv(path))
+
+    report = gazetteer.check_aliases(places)
+    for alias, kept, dropped in report["collisions"]:
+        print(f"⚠️  Alias {alias!r} of {dropped!r} is already used by {kept!r}; dropped")
+    if report["unkeyed"]:
+        raise SystemExit(f"❌ No usable name or alias for: {', '.join(report['unkeyed'])}")
+    if args.strict and report["collisions"]:
+        raise SystemExit(f"❌ {len(report['collisions'])} colliding alias(es) (--strict)")
+
+    out = args.out or gazetteer.DEFAULT_DATA_DIR
+    meta = gazetteer.write_gazetteer(places, out)
+    print(f"✅ Wrote {meta['places']} places, {meta['aliases']} aliases, {meta['forecasts']} forecasts to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Tests for the NWS circuit breaker and stale-while-revalidate cache (no network, no ADK)."""
+
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+# Load by path so the tests do not import the agent (and ADK).
+_spec = importlib.util.spec_from_file_location("nws", Path(__file__).parents[1] / "agent" / "nws.py")
+nws = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nws)
+
+SUNNY = {"temperature": "70°F", "forecast": "Sunny"}
+
+
+def client(fetch, cooldown=60.0, fresh=600.0, start_refresher=True):
+    breaker = nws.CircuitBreaker(failure_threshold=2, cooldown_seconds=cooldown, latency_slo_seconds=5.0)
+    c = nws.NwsClient(1.0, breaker, fresh_seconds=fresh, cache_size=8, refresh_interval_seconds=3600)
+    c._fetch = fetch
+    if not start_refresher:
+        c._ensure_refresher = lambda: None
+    return c
+
+
+def failing(exc):
+    def fetch(coords):
+        raise exc
+    return fetch
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_after_cooldown():
+    breaker = nws.CircuitBreaker(failure_threshold=2, cooldown_seconds=0.05, latency_slo_seconds=1.0)
+    breaker.record(False)
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record(True, 0.1)
+    assert breaker.state == "closed"
+
+
+def test_slow_success_counts_as_failure():
+    breaker = nws.CircuitBreaker(failure_threshold=1, cooldown_seconds=60, latency_slo_seconds=1.0)
+    breaker.record(True, 2.0)
+    assert breaker.state == "open"
+
+
+@pytest.mark.parametrize("exc", [requests.exceptions.ConnectionError("down"), TypeError("'NoneType' is not subscriptable")])
+def test_any_upstream_failure_settles_the_half_open_probe(exc):
+    c = client(failing(exc), cooldown=0.0, start_refresher=False)
+    for _ in range(2):
+        assert c.forecast("1,2")["status"] == "error"
+    assert c.breaker.state == "open"
+
+    assert c.forecast("1,2")["status"] == "error"  # the half-open probe fails...
+    assert c.breaker.state == "open" and not c.breaker._probing
+    c._fetch = lambda coords: SUNNY
+    assert c.forecast("1,2") == {"status": "success", **SUNNY}  # ...and the next one may close it
+    assert c.breaker.state == "closed"
+
+
+def test_stale_entry_is_served_at_once_with_one_queued_refresh():
+    calls = []
+    c = client(lambda coords: calls.append(coords) or SUNNY, start_refresher=False)
+    c.forecast("1,2")
+    c._cache["1,2"].fetched_at -= 700  # stale, but not yet twice the freshness window
+
+    for _ in range(3):
+        assert c.forecast("1,2") == {"status": "success", **SUNNY}
+    assert calls == ["1,2"]
+    assert c._revalidate.qsize() == 1
+
+
+def test_stale_note_when_the_breaker_is_not_closed():
+    c = client(lambda coords: SUNNY, start_refresher=False)
+    c.forecast("1,2")
+    c._cache["1,2"].fetched_at -= 700
+    c.breaker.state = "open"
+
+    assert "unavailable" in c.forecast("1,2")["note"]
+
+
+def test_refresher_survives_unexpected_errors():
+    refreshed = threading.Event()
+    c = client(lambda coords: SUNNY)
+    c.forecast("1,2")
+    c.forecast("3,4")
+    c._cache["1,2"].fetched_at -= 700
+    c._cache["3,4"].fetched_at -= 700
+
+    def fetch(coords):
+        if coords == "1,2":
+            raise TypeError("'NoneType' is not subscriptable")
+        refreshed.set()
+        return {**SUNNY, "forecast": "Rain"}
+
+    c._fetch = fetch
+    c.forecast("1,2")
+    c.forecast("3,4")
+    assert refreshed.wait(2.0)
+    assert c._refresher.is_alive()
+    deadline = time.monotonic() + 2.0
+    while c._cache["3,4"].forecast["forecast"] != "Rain" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert c.forecast("3,4")["forecast"] == "Rain"
@@ -5,29 +5,19 @@ This demonstrates how to build multi-agent systems where one agent can delegate
 specialized tasks to other agents. This is the "Agent-as-a-Tool" pattern.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
+from workshop_runtime import get_settings
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
-
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
 # --- Specialist Agent 1: Restaurant Critic ---
 
 restaurant_critic = Agent(
     name="restaurant_critic",
-    model="gemini-2.5-flash",
+    model=settings.model,
     instruction="""
     You are a sophisticated food critic with expertise in local cuisine. 
     When asked for restaurant recommendations, provide ONE specific restaurant suggestion 
@@ -46,7 +36,7 @@ restaurant_critic = Agent(
 
 hotel_concierge = Agent(
     name="hotel_concierge",
-    model="gemini-2.5-flash",
+    model=settings.model,
     instruction="""
     You are a professional five-star hotel concierge. Your role is to help guests with:
     - Restaurant recommendations (use the restaurant_critic for this)
@@ -65,7 +55,7 @@ hotel_concierge = Agent(
 
 root_agent = Agent(
     name="travel_concierge",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="A travel assistant that coordinates between hotel services and local experts.",
     instruction="""
     You are a comprehensive travel assistant. You can help with:
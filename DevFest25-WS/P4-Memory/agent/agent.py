@@ -6,54 +6,80 @@ It builds multi-day travel itineraries progressively, remembers previous days,
 and adapts to user feedback across multiple conversation turns.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import google_search
+from google.adk.tools.agent_tool import AgentTool
+from workshop_runtime import get_settings
+from .itinerary import ITINERARY_TOOLS
+from .memory import inject_memories, load_memory_store, remember_preference
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# --- Search Specialist ---
+# Built-in google_search cannot share an agent with function tools, so searches go
+# through a small specialist wrapped as an AgentTool (the P3 pattern).
+
+search_agent = Agent(
+    name="search_agent",
+    model=settings.model,
+    description="Looks up current venue details, opening hours and events for ONE activity or time slot.",
+    instruction="""
+    You research a single activity or time slot for a trip itinerary. Use Google Search to find
+    current venue details, operating hours and special events. Answer in 2-3 short sentences.
+    """,
+    tools=[google_search]
+)
 
 # --- Create the Adaptive Multi-Day Trip Planner Agent ---
 
 root_agent = Agent(
     name="multi_day_trip_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Agent that progressively plans a multi-day trip, remembering previous days and adapting to user feedback.",
     instruction="""
     You are the "Adaptive Trip Planner" 🗺️ - an AI assistant that builds multi-day travel itineraries step-by-step.
     
     Your Defining Feature:
-    You have conversational memory through sessions. You MUST refer back to our conversation to understand 
-    the trip's context, what has already been planned, and the user's preferences. If the user asks for 
-    a change, you must adapt the plan while keeping the unchanged parts consistent.
+    The trip plan is stored in session state and you edit it with tools. This is the plan so far:
+    
+    {itinerary_summary?}
     
     Your Mission:
-    1. **Initiate**: When starting a new trip, ask for the destination, trip duration, and interests.
-    2. **Plan Progressively**: Plan ONLY ONE DAY at a time. After presenting a plan, ask for confirmation.
-    3. **Handle Feedback**: If a user dislikes a suggestion (e.g., "I don't like museums"), acknowledge 
-       their feedback, and provide a *new, alternative* suggestion for that time slot that fits the theme.
+    1. **Initiate**: When starting a new trip, ask for the destination, trip duration, and interests,
+       then call `start_trip`.
+    2. **Plan Progressively**: Plan ONLY ONE DAY at a time. Save it with `append_day`, present it,
+       and ask for confirmation.
+    3. **Handle Feedback**: If a user dislikes a suggestion (e.g., "I don't like museums"), find a
+       *new, alternative* activity for THAT slot only and save it with `replace_slot`. Reply with
+       just the changed slot - do not repeat the rest of the day or the trip.
     4. **Maintain Context**: For each new day, ensure activities are unique and build logically on previous 
        days. Do not suggest the same things repeatedly.
-    5. **Final Output**: Return each day's itinerary in MARKDOWN format with clear time blocks.
+    5. **Search Sparingly**: Use `search_agent` only for the slots you are creating or changing,
+       never to re-check slots that are already planned.
+    6. **Final Output**: Return each new day's itinerary in MARKDOWN format with clear time blocks.
+    7. **Remember the Traveller**: When the user states a lasting preference (diet, pace, budget,
+       things they never want), save it with `remember_preference` so future trips can use it.
     
     Preferred Destinations:
     - Munich, Germany (beer gardens, museums, markets)
     - Bavaria region (castles, Alps, lakes)
     - Rio de Janeiro, Brazil (beaches, Christ the Redeemer, Sugarloaf Mountain)
-    
-    Use Google Search to find current information about venues, operating hours, and special events.
     """,
-    tools=[google_search]
+    # The itinerary tools stay on ADK's event loop: they read-modify-write the
+    # itinerary in session state, and parallel calls from one model response must
+    # not interleave. Only their memory writes (embedding and file append) leave
+    # the loop, on the memory store's writer thread
+    tools=[AgentTool(agent=search_agent), *ITINERARY_TOOLS, remember_preference],
+    # Long-term memory: only the top-k memories relevant to the latest message are
+    # added to the prompt, never the user's full history
+    before_model_callback=inject_memories,
 )
 
+# --- Warm-up ---
+# Called by the container's startup phase (workshop_runtime.warmup) before it reports ready
+
+def warmup():
+    """Loads and indexes the long-term memory store ahead of the first request."""
+    load_memory_store()
@@ -0,0 +1,108 @@
+"""
+Itinerary data model and patch tools for the Adaptive Trip Planner.
+
+The trip is kept in session state as structured data (days x morning/afternoon/
+evening slots) instead of only living in the chat history. The agent edits it
+through small patch tools, so rejecting one activity changes one slot: the agent
+only has to research and write that slot, and only that slot is sent back.
+
+State keys:
+    itinerary          {"destination", "interests", "days": [{"morning", "afternoon", "evening"}, ...]}
+    itinerary_summary  compact one-line-per-slot text of the plan, used in the agent instruction
+
+Every trip, planned day and rejected activity is also written to the long-term
+memory store (see memory.py), so later sessions can build on it.
+"""
+
+from google.adk.tools.tool_context import ToolContext
+from .memory import remember
+
+SLOTS = ("morning", "afternoon", "evening")
+
+
+def _summarize(itinerary: dict) -> str:
+    lines = [f"Trip to {itinerary['destination']} ({itinerary['interests'] or 'no stated interests'})"]
+    for number, day in enumerate(itinerary["days"], start=1):
+        for slot in SLOTS:
+            lines.append(f"Day {number} {slot}: {day[slot] or '(open)'}")
+    return "\n".join(lines)
+
+
+def _save(tool_context: ToolContext, itinerary: dict):
+    # Assign (rather than mutate) so ADK records the change as a state delta.
+    tool_context.state["itinerary"] = itinerary
+    tool_context.state["itinerary_summary"] = _summarize(itinerary)
+
+
+def _load(tool_context: ToolContext) -> dict | None:
+    itinerary = tool_context.state.get("itinerary")
+    if not itinerary:
+        return None
+    return {**itinerary, "days": [dict(day) for day in itinerary["days"]]}
+
+
+def start_trip(destination: str, interests: str, tool_context: ToolContext) -> dict:
+    """Starts a new, empty itinerary. Call this once the destination is known.
+
+    Args:
+        destination: Where the trip goes, e.g. "Munich".
+        interests: The traveller's interests, e.g. "beer gardens, history".
+
+    Returns:
+        A confirmation with the (empty) number of planned days.
+    """
+    _save(tool_context, {"destination": destination, "interests": interests, "days": []})
+    remember(tool_context, "itinerary", f"Planned a trip to {destination}; interests: {interests or 'none stated'}")
+    return {"status": "success", "destination": destination, "days": 0}
+
+
+def append_day(morning: str, afternoon: str, evening: str, tool_context: ToolContext) -> dict:
+    """Adds the next day to the itinerary.
+
+    Args:
+        morning: The morning activity, with venue name and time.
+        afternoon: The afternoon activity, with venue name and time.
+        evening: The evening activity, with venue name and time.
+
+    Returns:
+        The number of the day that was added.
+    """
+    itinerary = _load(tool_context)
+    if itinerary is None:
+        return {"status": "error", "message": "No trip started yet. Call start_trip first."}
+    itinerary["days"].append({"morning": morning, "afternoon": afternoon, "evening": evening})
+    _save(tool_context, itinerary)
+    remember(tool_context, "itinerary", (
+        f"{itinerary['destination']} day {len(itinerary['days'])}: "
+        f"morning {morning}; afternoon {afternoon}; evening {evening}"
+    ))
+    return {"status": "success", "day": len(itinerary["days"])}
+
+
+def replace_slot(day: int, slot: str, activity: str, tool_context: ToolContext) -> dict:
+    """Replaces a single activity, e.g. after the user rejects it. Other slots are kept.
+
+    Args:
+        day: The day number, starting at 1.
+        slot: One of "morning", "afternoon" or "evening".
+        activity: The new activity, with venue name and time.
+
+    Returns:
+        The updated slot and the activity it replaced.
+    """
+    itinerary = _load(tool_context)
+    if itinerary is None:
+        return {"status": "error", "message": "No trip started yet. Call start_trip first."}
+    if slot not in SLOTS:
+        return {"status": "error", "message": f"Unknown slot '{slot}'. Use one of: {', '.join(SLOTS)}."}
+    if not 1 <= day <= len(itinerary["days"]):
+        return {"status": "error", "message": f"Day {day} is not planned yet. The trip has {len(itinerary['days'])} day(s)."}
+    previous = itinerary["days"][day - 1][slot]
+    itinerary["days"][day - 1][slot] = activity
+    _save(tool_context, itinerary)
+    if previous:
+        remember(tool_context, "rejected", f"In {itinerary['destination']}, rejected: {previous}")
+    return {"status": "success", "day": day, "slot": slot, "activity": activity, "replaced": previous}
+
+
+ITINERARY_TOOLS = [start_trip, append_day, replace_slot]
@@ -0,0 +1,261 @@
+"""
+Long-term, cross-session memory for the Adaptive Trip Planner.
+
+Sessions only remember one conversation. This module keeps what matters across
+sessions — past itineraries, stated preferences, rejected suggestions — in a
+local vector index, and puts only the top-k memories relevant to the current
+message into the prompt. Prompts stay the same size no matter how long a user
+has been planning with us.
+
+Everything runs offline:
+
+- `HashingEmbedder` turns text into fixed-size vectors by hashing words and word
+  pairs (no model download, deterministic across processes).
+- `VectorIndex` does exact cosine search with one NumPy matrix product, or, with
+  `index="ivf"`, clusters vectors into inverted lists and only scans the lists
+  closest to the query once there are enough memories to make that worthwhile.
+- `MemoryStore` appends memories to a JSON-lines file and rebuilds the index on
+  start-up (vectors are recomputed, so only text is stored). Tools record through
+  `add_later`, which does the embedding and file append on one writer thread so
+  the event loop never waits on disk.
+
+The itinerary tools record trips and rejected activities as they happen,
+`remember_preference` records what the traveller tells us about themselves, and
+`inject_memories` (a before-model callback) adds the top-k memories from the
+user's *other* sessions to the system instruction.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.tools.tool_context import ToolContext
+from workshop_runtime import get_settings
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """Signed feature hashing of unigrams and bigrams into `dim` dimensions."""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _tokens(self, text: str) -> list:
+        folded = unicodedata.normalize("NFKD", text.casefold())
+        words = _WORD.findall("".join(ch for ch in folded if not unicodedata.combining(ch)))
+        # Crude plural folding, so "museums" and "museum" share a feature.
+        words = [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in self._tokens(text):
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dim
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """Cosine-similarity index over unit vectors: brute force, or IVF when large.
+
+    Args:
+        dim: Vector size.
+        index: "flat" for exact search, "ivf" for inverted lists.
+        nlist: Number of IVF clusters (used once there are 8 x nlist vectors).
+        nprobe: Clusters scanned per IVF query.
+    """
+
+    def __init__(self, dim: int, index: str = "flat", nlist: int = 32, nprobe: int = 4):
+        if index not in ("flat", "ivf"):
+            raise ValueError(f"index must be 'flat' or 'ivf', got {index!r}")
+        self.index = index
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._centroids = None
+        self._lists = None
+        self._trained_on = 0
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, vectors: np.ndarray):
+        self._vectors = np.vstack([self._vectors, vectors.astype(np.float32)])
+        # Retrain the coarse quantizer whenever the index has doubled since the last training.
+        if self.index == "ivf" and len(self) >= 8 * self.nlist and len(self) >= 2 * self._trained_on:
+            self._train()
+        elif self._lists is not None:
+            assignments = np.argmax(vectors @ self._centroids.T, axis=1)
+            start = len(self) - len(vectors)
+            for offset, cluster in enumerate(assignments):
+                self._lists[cluster] = np.append(self._lists[cluster], start + offset)
+
+    def _train(self, iterations: int = 10):
+        rng = np.random.default_rng(0)
+        centroids = self._vectors[rng.choice(len(self), self.nlist, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(self._vectors @ centroids.T, axis=1)
+            for cluster in range(self.nlist):
+                members = self._vectors[assignments == cluster]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    centroids[cluster] = mean / max(np.linalg.norm(mean), 1e-12)
+        assignments = np.argmax(self._vectors @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._lists = [np.flatnonzero(assignments == cluster) for cluster in range(self.nlist)]
+        self._trained_on = len(self)
+
+    def search(self, query: np.ndarray, k: int, mask: np.ndarray | None = None) -> list:
+        """Returns up to `k` (row, score) pairs, best first. `mask` filters rows."""
+        if k <= 0 or not len(self):
+            return []
+        if self._lists is not None:
+            probes = np.argsort(self._centroids @ query)[::-1][: self.nprobe]
+            candidates = np.concatenate([self._lists[c] for c in probes])
+        else:
+            candidates = np.arange(len(self))
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if not len(candidates):
+            return []
+        scores = self._vectors[candidates] @ query
+        top = np.argsort(scores)[::-1][:k] if len(scores) <= k else np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+
+class MemoryStore:
+    """Per-user memories persisted as JSON lines, searchable by meaning."""
+
+    KINDS = ("preference", "itinerary", "rejected")
+
+    def __init__(self, path, index: str = "flat", embedder: HashingEmbedder | None = None):
+        self.path = Path(path)
+        self.embedder = embedder or HashingEmbedder()
+        self.index = VectorIndex(self.embedder.dim, index=index)
+        self.records = []
+        # Owner columns, one code per row, so filtering by user is one vectorized compare
+        self._codes = {}  # user or session id -> int code
+        self._users = np.zeros(0, dtype=np.int32)
+        self._sessions = np.zeros(0, dtype=np.int32)
+        self._lock = threading.Lock()
+        self._writer = None  # single thread, so memories are appended in order
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+            self._index(records)
+
+    def _index(self, records):
+        if records:
+            self.index.add(self.embedder.embed([r["text"] for r in records]))
+            self.records.extend(records)
+            self._users = np.append(self._users, [self._code(r["user_id"]) for r in records]).astype(np.int32)
+            self._sessions = np.append(self._sessions, [self._code(r["session_id"]) for r in records]).astype(np.int32)
+
+    def _code(self, owner: str) -> int:
+        return self._codes.setdefault(owner, len(self._codes))
+
+    def add(self, user_id: str, session_id: str, kind: str, text: str):
+        self._check(kind)
+        record = {"user_id": user_id, "session_id": session_id, "kind": kind, "text": text}
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._index([record])
+
+    def add_later(self, user_id: str, session_id: str, kind: str, text: str):
+        """Like `add`, but on the store's writer thread; returns the future."""
+        self._check(kind)
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-writer")
+        return self._writer.submit(self.add, user_id, session_id, kind, text)
+
+    def _check(self, kind: str):
+        if kind not in self.KINDS:
+            raise ValueError(f"kind must be one of {self.KINDS}, got {kind!r}")
+
+    def search(self, user_id: str, query: str, k: int, exclude_session: str | None = None) -> list:
+        """The user's `k` memories most relevant to `query`, best first."""
+        with self._lock:
+            if user_id not in self._codes:
+                return []
+            mask = self._users == self._codes[user_id]
+            if exclude_session in self._codes:
+                mask &= self._sessions != self._codes[exclude_session]
+            hits = self.index.search(self.embedder.embed([query])[0], k, mask)
+            return [{**self.records[row], "score": round(score, 3)} for row, score in hits if score > 0]
+
+
+# --- Agent Integration ---
+
+
+@lru_cache(maxsize=None)
+def load_memory_store() -> MemoryStore:
+    """The process-wide memory store, configured by settings."""
+    settings = get_settings()
+    if settings.memory_top_k < 0:
+        raise ValueError(f"WORKSHOP_MEMORY_TOP_K must be 0 (off) or more, got {settings.memory_top_k}")
+    return MemoryStore(settings.memory_path, index=settings.memory_index)
+
+
+def _owner(context) -> tuple:
+    return context.user_id, context.session.id
+
+
+def remember(tool_context: ToolContext, kind: str, text: str):
+    """Stores one memory for the current user (used by the itinerary tools).
+
+    The write happens on the store's writer thread, so tools that run on the event
+    loop do not block it.
+    """
+    load_memory_store().add_later(*_owner(tool_context), kind, text)
+
+
+def remember_preference(preference: str, tool_context: ToolContext) -> dict:
+    """Saves a lasting preference of the traveller so future trips can use it.
+
+    Args:
+        preference: What the traveller likes, dislikes or needs, in one sentence,
+            e.g. "Vegetarian; prefers quiet neighbourhoods over nightlife."
+
+    Returns:
+        A confirmation.
+    """
+    remember(tool_context, "preference", preference)
+    return {"status": "success"}
+
+
+def inject_memories(callback_context: CallbackContext, llm_request: LlmRequest):
+    """Adds the user's most relevant memories from earlier sessions to the prompt."""
+    query = ""
+    for content in reversed(llm_request.contents or []):
+        if content.role == "user":
+            query = " ".join(part.text for part in content.parts or [] if part.text)
+            if query:
+                break
+    top_k = get_settings().memory_top_k
+    if not query or top_k <= 0:
+        return None
+    user_id, session_id = _owner(callback_context)
+    hits = load_memory_store().search(user_id, query, top_k, exclude_session=session_id)
+    if hits:
+        lines = [f"- ({hit['kind']}) {hit['text']}" for hit in hits]
+        llm_request.append_instructions([
+            "What you remember about this traveller from earlier trips "
+            "(respect preferences, do not re-suggest rejected activities):\n" + "\n".join(lines)
+        ])
+    return None
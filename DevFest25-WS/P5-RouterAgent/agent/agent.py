@@ -5,30 +5,22 @@ This demonstrates a router pattern where a master agent analyzes requests
 and delegates them to specialist agents. Foundation for complex multi-agent systems.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent
+from google.adk.apps import App
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
+from workshop_runtime import get_settings
+from workshop_runtime.cassette import cassette_plugins
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
-
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
 # --- Specialist Agent 1: Day Trip Planner ---
 
 day_trip_agent = Agent(
     name="day_trip_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Agent specialized in generating spontaneous full-day itineraries based on mood, interests, and budget.",
     instruction="""
     You are the "Spontaneous Day Trip" Generator 🚗 - a specialized AI assistant that creates engaging full-day itineraries.
@@ -53,7 +45,7 @@ day_trip_agent = Agent(
 
 foodie_agent = Agent(
     name="foodie_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Expert food critic specialized in finding the best restaurants and culinary experiences.",
     instruction="""
     You are an expert food critic. Your goal is to find the absolute best food, restaurants, or culinary experiences based on a user's request.
@@ -75,7 +67,7 @@ foodie_agent = Agent(
 
 weekend_guide_agent = Agent(
     name="weekend_guide_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Local events guide specialized in finding concerts, festivals, and weekend activities.",
     instruction="""
     You are a local events guide. Your task is to find interesting events, concerts, festivals, and activities happening on a specific weekend or timeframe.
@@ -97,7 +89,7 @@ weekend_guide_agent = Agent(
 
 transportation_agent = Agent(
     name="transportation_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Navigation assistant providing directions and transportation options.",
     instruction="""
     You are a navigation assistant. Given a starting point and a destination, provide clear directions on how to get from start to end.
@@ -129,7 +121,7 @@ transportation_tool = AgentTool(agent=transportation_agent)
 
 router_agent = Agent(
     name="router_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     description="Master router that analyzes requests and delegates to specialist agents.",
     instruction="""
     You are a request router and intelligent delegator. Your job is to:
@@ -156,3 +148,12 @@ router_agent = Agent(
 
 root_agent = router_agent
 
+# --- App: Optional Record/Replay of Model and Tool Traffic ---
+# WORKSHOP_CASSETTE_MODE=record|replay captures or serves back every model and tool
+# call (see workshop-runtime), so routing overhead can be measured offline.
+
+app = App(
+    name="agent",
+    root_agent=root_agent,
+    plugins=cassette_plugins()
+)
@@ -6,30 +6,23 @@ passing information through a shared state. Perfect for multi-step tasks like
 "find a restaurant THEN get directions to it."
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent, SequentialAgent
+from google.adk.apps import App
 from google.adk.tools import google_search
+from workshop_runtime import get_settings
+from workshop_runtime.cassette import cassette_plugins
+from workshop_runtime.events import EventPolicy, event_compaction_plugin
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
-
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
 # --- Step 1: Food Finder Agent ---
 # This agent finds a restaurant and saves the name to shared state
 
 foodie_agent = Agent(
     name="foodie_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are an expert food critic. Your goal is to find the best restaurant based on the user's request.
@@ -50,7 +43,7 @@ foodie_agent = Agent(
 
 transportation_agent = Agent(
     name="transportation_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are a navigation assistant. Provide clear directions to the destination.
@@ -81,3 +74,12 @@ find_and_navigate_agent = SequentialAgent(
 
 root_agent = find_and_navigate_agent
 
+# --- App: Event Compaction (and optional record/replay) for Web Clients ---
+# Every sub-agent step emits an event. With WORKSHOP_EVENT_POLICY=production the UI gets
+# foodie_agent's restaurant pick as a slim, state-only event; transportation_agent's answer is always sent in full.
+
+app = App(
+    name="agent",
+    root_agent=root_agent,
+    plugins=[event_compaction_plugin(EventPolicy.from_settings(), public_authors=["transportation_agent"]), *cassette_plugins()]
+)
@@ -6,30 +6,23 @@ critique and refine plans until meeting constraints. The loop runs up to 3 itera
 automatically stopping when a good plan is found.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent, SequentialAgent, LoopAgent
+from google.adk.apps import App
 from google.adk.tools import google_search
+from workshop_runtime import get_settings
+from workshop_runtime.cassette import cassette_plugins
+from workshop_runtime.events import EventPolicy, event_compaction_plugin, loop_members
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
-
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
 # --- Step 1: Planner Agent ---
 # Creates an initial plan with activity + restaurant
 
 planner_agent = Agent(
     name="planner_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are a trip planner. Based on the user's request, propose ONE activity and ONE restaurant.
@@ -52,7 +45,7 @@ planner_agent = Agent(
 
 critic_agent = Agent(
     name="critic_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are a logistics expert. Your job is to critique a travel plan based on travel time.
@@ -76,7 +69,7 @@ critic_agent = Agent(
 
 refiner_agent = Agent(
     name="refiner_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are a trip planner, refining a plan based on criticism.
@@ -122,3 +115,20 @@ iterative_planner_agent = SequentialAgent(
 
 root_agent = iterative_planner_agent
 
+# --- App: Event Compaction (and optional record/replay) for Web Clients ---
+# Every sub-agent step emits an event. With WORKSHOP_EVENT_POLICY=production the UI gets
+# each critic pass as a slim, state-only event, and /compact/run_sse coalesces the passes:
+# refiner_agent answers once per iteration, so only its last answer (after the loop) is sent.
+
+app = App(
+    name="agent",
+    root_agent=root_agent,
+    plugins=[
+        event_compaction_plugin(
+            EventPolicy.from_settings(),
+            public_authors=["refiner_agent"],
+            loop_authors=loop_members(root_agent),
+        ),
+        *cassette_plugins(),
+    ]
+)
@@ -6,29 +6,22 @@ When a user needs multiple independent pieces of information, ParallelAgent exec
 all specialists concurrently, then synthesizes their results into a unified response.
 """
 
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from google.adk.agents import Agent, ParallelAgent, SequentialAgent
+from google.adk.apps import App
 from google.adk.tools import google_search
+from workshop_runtime import get_settings
+from workshop_runtime.cassette import cassette_plugins
+from workshop_runtime.events import EventPolicy, event_compaction_plugin
 
-# Load environment variables from shared .env file (two folders up)
-env_path = Path(__file__).parent.parent.parent / '.env'
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-else:
-    print(f"ℹ️  No .env file found at {env_path}, using system environment variables")
-
-# Verify API key is set
-if not os.getenv('GOOGLE_API_KEY'):
-    print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+# Shared runtime settings: loads the workshop .env once per process and holds the
+# tuning knobs (model, timeouts, pool sizes, ...) set per deployment
+settings = get_settings()
 
 # --- Specialist Agent 1: Museum Finder ---
 
 museum_finder_agent = Agent(
     name="museum_finder_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are a museum expert. Find the best museum based on the user's query.
@@ -45,7 +38,7 @@ museum_finder_agent = Agent(
 
 concert_finder_agent = Agent(
     name="concert_finder_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are an events guide. Find a concert or live music event based on the user's query.
@@ -62,7 +55,7 @@ concert_finder_agent = Agent(
 
 restaurant_finder_agent = Agent(
     name="restaurant_finder_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     tools=[google_search],
     instruction="""
     You are an expert food critic. Find the best restaurant based on the user's request.
@@ -87,7 +80,7 @@ parallel_research_agent = ParallelAgent(
 
 synthesis_agent = Agent(
     name="synthesis_agent",
-    model="gemini-2.5-flash",
+    model=settings.model,
     instruction="""
     You are a helpful assistant. Combine the following research results into a clear, well-formatted response for the user.
     
@@ -114,3 +107,12 @@ parallel_planner_agent = SequentialAgent(
 
 root_agent = parallel_planner_agent
 
+# --- App: Event Compaction (and optional record/replay) for Web Clients ---
+# Every sub-agent step emits an event. With WORKSHOP_EVENT_POLICY=production the UI gets
+# each parallel branch as a slim, state-only event; synthesis_agent's answer is always sent in full.
+
+app = App(
+    name="agent",
+    root_agent=root_agent,
+    plugins=[event_compaction_plugin(EventPolicy.from_settings(), public_authors=["synthesis_agent"]), *cassette_plugins()]
+)
@@ -0,0 +1,146 @@
+"""
+Fake Gemini backend for load testing the workshop agents.
+
+Serves the two Gemini API endpoints ADK uses (`generateContent` and
+`streamGenerateContent`) with canned answers after a configurable delay, so a
+load test measures our container rather than the model. Point the agent at it
+with the google-genai base URL override:
+
+    python fake_backends.py --port 9000 --model-latency-ms 800 --search-latency-ms 400
+
+    docker run -p 8000:8000 \\
+      -e GOOGLE_API_KEY=fake \\
+      -e GOOGLE_GEMINI_BASE_URL=http://host.docker.internal:9000 \\
+      <image>
+
+`google_search` is a model-side (grounding) tool, so it is faked here too: a
+request that enables it waits an extra `--search-latency-ms`. Requests that
+declare function tools (custom tools, AgentTools) get one function call back
+first, so router and agent-team trees are exercised end to end.
+
+Only the standard library is used, so this runs anywhere without a virtualenv.
+"""
+
+import argparse
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_ROUTE = re.compile(r"/v1(?:beta|alpha)?/models/(?P<model>[^:/]+):(?P<method>generateContent|streamGenerateContent)")
+
+
+class FakeGemini:
+    """Builds canned Gemini responses for a request body."""
+
+    def __init__(self, model_latency_ms: float = 800, search_latency_ms: float = 400, response_words: int = 120):
+        self.model_latency = model_latency_ms / 1000
+        self.search_latency = search_latency_ms / 1000
+        self.response_words = response_words
+        self.calls = 0
+
+    def respond(self, body: dict) -> dict:
+        self.calls += 1
+        tools = body.get("tools") or []
+        delay = self.model_latency
+        if any("googleSearch" in tool or "google_search" in tool for tool in tools):
+            delay += self.search_latency
+        time.sleep(delay)
+
+        contents = body.get("contents") or [{}]
+        last_parts = contents[-1].get("parts") or []
+        declarations = [d for tool in tools for d in tool.get("functionDeclarations") or []]
+        answered_tool = any("functionResponse" in part for part in last_parts)
+
+        if declarations and not answered_tool:
+            part = {"functionCall": {"name": declarations[0]["name"], "args": self._args(declarations[0], contents)}}
+        else:
+            part = {"text": self._text(contents)}
+        prompt_tokens = len(json.dumps(contents)) // 4
+        output_tokens = self.response_words * 4 // 3 if "text" in part else 10
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [part]}, "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens,
+            },
+            "modelVersion": "fake-gemini",
+        }
+
+    def _user_text(self, contents) -> str:
+        for content in reversed(contents):
+            for part in content.get("parts") or []:
+                if content.get("role") == "user" and part.get("text"):
+                    return part["text"]
+        return ""
+
+    def _args(self, declaration: dict, contents) -> dict:
+        # Fill every string parameter with the user's text; enough for AgentTool
+        # ("request") and single-argument custom tools such as the weather tool.
+        schema = declaration.get("parameters") or declaration.get("parametersJsonSchema") or {}
+        properties = schema.get("properties") or {}
+        user_text = self._user_text(contents)
+        return {
+            name: user_text
+            for name, spec in properties.items()
+            if str(spec.get("type", "string")).lower() == "string"
+        }
+
+    def _text(self, contents) -> str:
+        words = ("Activity: Deutsches Museum, Restaurant: Augustiner Bräustuben. Approved: travel time is 10 minutes. "
+                 "Morning: English Garden walk. Afternoon: Viktualienmarkt. Evening: beer garden.").split()
+        return " ".join(words[i % len(words)] for i in range(self.response_words))
+
+
+def make_handler(fake: FakeGemini):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            match = _ROUTE.search(self.path)
+            if not match:
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            response = fake.respond(json.loads(self.rfile.read(length) or b"{}"))
+            if match["method"] == "streamGenerateContent":
+                payload = f"data: {json.dumps(response)}\r\n\r\n".encode()
+                content_type = "text/event-stream"
+            else:
+                payload = json.dumps(response).encode()
+                content_type = "application/json"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(port: int, fake: FakeGemini) -> ThreadingHTTPServer:
+    """Creates (but does not start) the fake backend server on `port`."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), make_handler(fake))
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini backend for load tests")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--model-latency-ms", type=float, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=400)
+    parser.add_argument("--response-words", type=int, default=120)
+    args = parser.parse_args()
+
+    fake = FakeGemini(args.model_latency_ms, args.search_latency_ms, args.response_words)
+    print(f"🤖 Fake Gemini listening on http://0.0.0.0:{args.port}")
+    serve(args.port, fake).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
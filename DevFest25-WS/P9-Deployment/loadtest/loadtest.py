@@ -0,0 +1,310 @@
+"""
+Load-test driver and capacity model for an `adk web` container.
+
+Sweeps client concurrency against a running agent (any of P1-P8), records latency
+percentiles, server memory (RSS) and event-loop lag, and recommends Cloud Run
+`--concurrency`, `--memory` and `--min-instances` values from the measurements.
+
+Typical run (fake model so the numbers describe our container, not Gemini):
+
+    python fake_backends.py --port 9000 &
+    docker run -d --name agent-under-test -p 8000:8000 \\
+      -e GOOGLE_API_KEY=fake -e GOOGLE_GEMINI_BASE_URL=http://host.docker.internal:9000 \\
+      --add-host=host.docker.internal:host-gateway <image>
+    python loadtest.py --url http://localhost:8000 --container agent-under-test \\
+      --prompt "Plan a relaxing day in Munich" --levels 1,2,4,8,16,32 --baseline-rps 0.5
+
+Event-loop lag is measured from the outside: a cheap endpoint (`/list-apps`) is
+polled during each level. It is served by the same asyncio loop as the agents,
+so its latency above the idle baseline is time the loop spent blocked or busy.
+
+Only the standard library is used.
+"""
+
+import argparse
+import json
+import math
+import statistics
+import subprocess
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+# Cloud Run memory sizes, in MiB, that the recommendation is rounded up to.
+CLOUD_RUN_MEMORY_MIB = [512, 1024, 2048, 4096, 8192, 16384, 32768]
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class AdkClient:
+    """Minimal client for the `adk web` HTTP API."""
+
+    def __init__(self, url: str, app: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.app = app
+        self.timeout = timeout
+
+    def _request(self, path: str, body: dict | None = None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.url + path, data=data, headers={"Content-Type": "application/json"},
+            method="POST" if data is not None else "GET",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read() or b"null")
+
+    def ping(self):
+        return self._request("/list-apps")
+
+    def run(self, prompt: str) -> int:
+        """Creates a session, sends one message and returns the number of events."""
+        user_id = f"load-{uuid.uuid4().hex[:8]}"
+        session = self._request(f"/apps/{self.app}/users/{user_id}/sessions", {})
+        events = self._request("/run", {
+            "app_name": self.app,
+            "user_id": user_id,
+            "session_id": session["id"],
+            "new_message": {"role": "user", "parts": [{"text": prompt}]},
+            "streaming": False,
+        })
+        return len(events or [])
+
+
+class RssSampler(threading.Thread):
+    """Samples server memory from a local PID or a Docker container."""
+
+    def __init__(self, pid: int | None = None, container: str | None = None, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.container = container
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+
+    def read_mib(self) -> float | None:
+        if self.pid:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        if self.container:
+            out = subprocess.run(
+                ["docker", "stats", "--no-stream", "--format", "{{.MemUsage}}", self.container],
+                capture_output=True, text=True, check=False,
+            ).stdout.split("/")[0].strip()
+            units = {"KiB": 1 / 1024, "MiB": 1, "GiB": 1024, "kB": 1 / 1024, "MB": 1, "GB": 1024, "B": 1 / 1024 / 1024}
+            for unit, factor in units.items():
+                if out.endswith(unit):
+                    return float(out[: -len(unit)]) * factor
+        return None
+
+    def run(self):
+        while not self._done.is_set():
+            value = self.read_mib()
+            if value is not None:
+                self.samples.append(value)
+            self._done.wait(self.interval)
+
+    def stop(self) -> float:
+        self._done.set()
+        self.join()
+        return max(self.samples, default=0.0)
+
+
+class LagProbe(threading.Thread):
+    """Polls a cheap endpoint to estimate event-loop lag under load."""
+
+    def __init__(self, client: AdkClient, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.client = client
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            started = time.perf_counter()
+            try:
+                self.client.ping()
+                self.samples.append((time.perf_counter() - started) * 1000)
+            except OSError:
+                pass
+            self._done.wait(self.interval)
+
+    def stop(self) -> list:
+        self._done.set()
+        self.join()
+        return self.samples
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    requests: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    loop_lag_p95_ms: float
+    peak_rss_mib: float
+    events_per_request: float
+    error_messages: list = field(default_factory=list)
+
+
+def run_level(client: AdkClient, prompt: str, concurrency: int, requests: int, idle_ping_ms: float,
+              pid: int | None, container: str | None) -> LevelResult:
+    latencies, events, errors = [], [], []
+    lock = threading.Lock()
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            count = client.run(prompt)
+        except Exception as e:  # record and keep going; errors are part of the result
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+            return
+        with lock:
+            latencies.append((time.perf_counter() - started) * 1000)
+            events.append(count)
+
+    rss, lag = RssSampler(pid, container), LagProbe(client)
+    rss.start()
+    lag.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    lag_samples = lag.stop()
+    peak_rss = rss.stop()
+
+    return LevelResult(
+        concurrency=concurrency,
+        requests=requests,
+        errors=len(errors),
+        throughput_rps=len(latencies) / elapsed if elapsed else 0.0,
+        mean_ms=statistics.fmean(latencies) if latencies else 0.0,
+        p50_ms=percentile(latencies, 50),
+        p95_ms=percentile(latencies, 95),
+        p99_ms=percentile(latencies, 99),
+        loop_lag_p95_ms=max(0.0, percentile(lag_samples, 95) - idle_ping_ms),
+        peak_rss_mib=peak_rss,
+        events_per_request=statistics.fmean(events) if events else 0.0,
+        error_messages=sorted(set(errors))[:5],
+    )
+
+
+def recommend(results, idle_rss_mib: float, slo_p95_ms: float, lag_budget_ms: float, max_error_rate: float,
+              baseline_rps: float, peak_rps: float, headroom: float) -> dict:
+    """Turns a concurrency sweep into a Cloud Run sizing profile.
+
+    - concurrency: the highest level that met the p95 SLO, the loop-lag budget and
+      the error budget.
+    - memory: peak RSS at that level x headroom, rounded up to a Cloud Run size.
+    - min/max instances: Little's law (in-flight = rps x mean latency) divided by
+      the per-instance concurrency, for the steady and peak request rates. It needs
+      the mean, not the median: agent latencies are right-skewed, so p50 under-sizes.
+    """
+    healthy = [
+        r for r in results
+        if r.p95_ms <= slo_p95_ms
+        and r.loop_lag_p95_ms <= lag_budget_ms
+        and r.errors <= max_error_rate * r.requests
+    ]
+    chosen = max(healthy, key=lambda r: r.concurrency) if healthy else min(results, key=lambda r: r.concurrency)
+
+    rss = max(chosen.peak_rss_mib, idle_rss_mib)
+    if rss:
+        memory = next((m for m in CLOUD_RUN_MEMORY_MIB if m >= rss * headroom), CLOUD_RUN_MEMORY_MIB[-1])
+    else:
+        memory = None  # no RSS source given
+
+    latency_s = chosen.mean_ms / 1000
+
+    def instances(rps):
+        return math.ceil(rps * latency_s / chosen.concurrency) if rps else 0
+
+    return {
+        "concurrency": chosen.concurrency,
+        "memory": f"{memory}Mi" if memory and memory < 1024 else (f"{memory // 1024}Gi" if memory else None),
+        "min_instances": instances(baseline_rps),
+        "max_instances": max(1, instances(peak_rps)) if peak_rps else None,
+        "met_slo": bool(healthy),
+        "basis": asdict(chosen),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrency sweep and Cloud Run sizing for an adk web server")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--app", default="agent", help="ADK app name (the agent folder)")
+    parser.add_argument("--prompt", default="Plan a relaxing day in Munich")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests-per-level", type=int, default=0, help="default: max(10, 4 x concurrency)")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--pid", type=int, help="server PID for RSS sampling (local run)")
+    parser.add_argument("--container", help="Docker container name for RSS sampling")
+    parser.add_argument("--slo-p95-ms", type=float, default=0, help="default: 2 x p95 at concurrency 1")
+    parser.add_argument("--lag-budget-ms", type=float, default=100)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--baseline-rps", type=float, default=0, help="steady traffic to keep warm")
+    parser.add_argument("--peak-rps", type=float, default=0)
+    parser.add_argument("--headroom", type=float, default=1.5, help="memory safety factor")
+    parser.add_argument("--json", help="write the raw results and recommendation to this file")
+    args = parser.parse_args()
+
+    client = AdkClient(args.url, args.app, args.timeout)
+    idle_pings = []
+    for _ in range(10):
+        started = time.perf_counter()
+        client.ping()
+        idle_pings.append((time.perf_counter() - started) * 1000)
+    idle_ping_ms = statistics.median(idle_pings)
+    idle_rss = RssSampler(args.pid, args.container).read_mib() or 0.0
+    print(f"🔎 Idle: ping {idle_ping_ms:.1f} ms, RSS {idle_rss:.0f} MiB")
+
+    results = []
+    print(f"{'conc':>5} {'reqs':>5} {'err':>4} {'rps':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'lag95':>7} {'rss':>7} {'ev/req':>7}")
+    for level in (int(x) for x in args.levels.split(",")):
+        requests = args.requests_per_level or max(10, 4 * level)
+        r = run_level(client, args.prompt, level, requests, idle_ping_ms, args.pid, args.container)
+        results.append(r)
+        print(f"{r.concurrency:>5} {r.requests:>5} {r.errors:>4} {r.throughput_rps:>7.2f} {r.mean_ms:>8.0f} {r.p50_ms:>8.0f} "
+              f"{r.p95_ms:>8.0f} {r.p99_ms:>8.0f} {r.loop_lag_p95_ms:>7.0f} {r.peak_rss_mib:>7.0f} {r.events_per_request:>7.1f}")
+        for message in r.error_messages:
+            print(f"      ⚠️  {message}")
+
+    slo = args.slo_p95_ms or 2 * results[0].p95_ms
+    profile = recommend(results, idle_rss, slo, args.lag_budget_ms, args.max_error_rate,
+                        args.baseline_rps, args.peak_rps, args.headroom)
+
+    print(f"\n📐 Recommendation (p95 SLO {slo:.0f} ms, loop-lag budget {args.lag_budget_ms:.0f} ms):")
+    if not profile["met_slo"]:
+        print("   ⚠️  No level met the SLO; using the lowest level tested.")
+    flags = [f"--concurrency {profile['concurrency']}", f"--min-instances {profile['min_instances']}"]
+    if profile["memory"]:
+        flags.append(f"--memory {profile['memory']}")
+    if profile["max_instances"]:
+        flags.append(f"--max-instances {profile['max_instances']}")
+    print("   gcloud run deploy your-agent " + " ".join(flags))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"idle_ping_ms": idle_ping_ms, "idle_rss_mib": idle_rss,
+                       "levels": [asdict(r) for r in results], "recommendation": profile}, f, indent=2)
+        print(f"   Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Tests for cassette storage and matching (no ADK needed)."""
+
+import pytest
+
+from workshop_runtime.cassette import Cassette, CassetteMiss
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    recorded = Cassette(tmp_path / "c.jsonl.gz")
+    recorded.append({"kind": "run", "owner": "root", "key": "", "session": "s1", "prompt": "plan Munich"})
+    recorded.append({"kind": "model", "owner": "planner", "key": "k1", "seconds": 0.5, "response": {"n": 1}})
+    recorded.append({"kind": "run", "owner": "root", "key": "", "session": "s1", "prompt": "now day 2"})
+    recorded.append({"kind": "model", "owner": "planner", "key": "k2", "seconds": 0.5, "response": {"n": 2}})
+    recorded.append({"kind": "run", "owner": "root", "key": "", "session": "s2", "prompt": "plan Rio"})
+    return Cassette.load(recorded.path)
+
+
+def test_take_counts_hits_and_fallbacks(cassette):
+    assert cassette.take("model", "planner", "k2")["response"] == {"n": 2}
+    assert cassette.take("model", "planner", "changed")["response"] == {"n": 1}
+    assert (cassette.hits, cassette.fallbacks) == (1, 1)
+
+    with pytest.raises(CassetteMiss):
+        cassette.take("model", "planner", "k1")
+
+
+def test_strict_take_refuses_to_fall_back(cassette):
+    with pytest.raises(CassetteMiss):
+        cassette.take("model", "planner", "changed", strict=True)
+    assert cassette.take("model", "planner", "k1", strict=True)["response"] == {"n": 1}
+
+
+def test_sessions_consume_the_cassette_independently(cassette):
+    assert cassette.take("model", "planner", "k1", session="a")["response"] == {"n": 1}
+    assert cassette.take("model", "planner", "k1", session="b")["response"] == {"n": 1}
+    assert cassette.take("model", "planner", "k2", session="a")["response"] == {"n": 2}
+
+    with pytest.raises(CassetteMiss):
+        cassette.take("model", "planner", "k1", session="a")
+    cassette.rewind()
+    assert cassette.take("model", "planner", "k1", session="a")["response"] == {"n": 1}
+
+
+def test_prompts_are_grouped_by_session(cassette):
+    assert cassette.sessions() == [["plan Munich", "now day 2"], ["plan Rio"]]
+
+
+def test_runs_without_session_replay_separately(tmp_path):
+    old = Cassette(tmp_path / "old.jsonl.gz")
+    old.append({"kind": "run", "owner": "root", "key": "", "prompt": "a"})
+    old.append({"kind": "run", "owner": "root", "key": "", "prompt": "b"})
+
+    assert Cassette.load(old.path).sessions() == [["a"], ["b"]]
@@ -0,0 +1,190 @@
+"""Behavioural tests for the event pipeline, using stand-ins for ADK events."""
+
+import asyncio
+from types import SimpleNamespace
+
+from workshop_runtime.events import EventPipeline, EventPolicy, EventStream, pump_events, stream_events
+
+
+def event(author, text="", delta=None, final=True, partial=False, id=None):
+    part = SimpleNamespace(text=text, function_call=None)
+    return SimpleNamespace(
+        id=id or f"{author}-{text}",
+        author=author,
+        content=SimpleNamespace(parts=[part]) if text else None,
+        actions=SimpleNamespace(state_delta=delta or {}),
+        partial=partial,
+        is_final_response=lambda: final,
+    )
+
+
+def loop_run():
+    # planner, then two critic -> refiner iterations of a LoopAgent
+    return [
+        event("planner", "plan A", {"plan": "A"}),
+        event("critic", "too far", {"criticism": "too far"}),
+        event("refiner", "plan B", {"plan": "B"}),
+        event("critic", "approved", {"criticism": "approved"}),
+        event("refiner", "plan B ok", {"plan": "B ok"}),
+    ]
+
+
+def run(pipeline, events):
+    payloads = []
+    for e in events:
+        payloads += pipeline.feed(e)
+    return payloads + pipeline.flush()
+
+
+def final_state(payloads):
+    state = {}
+    for payload in payloads:
+        state.update(payload.get("state_delta", {}))
+    return state
+
+
+def test_debug_forwards_one_payload_per_event_with_own_state():
+    payloads = run(EventPipeline(EventPolicy.named("debug"), ["refiner"]), loop_run())
+
+    assert len(payloads) == 5
+    assert [p["kind"] for p in payloads] == ["internal", "internal", "final", "internal", "final"]
+    assert payloads[2] == {"id": "refiner-plan B", "author": "refiner", "kind": "final", "text": "plan B", "state_delta": {"plan": "B"}}
+    assert final_state(payloads) == {"plan": "B ok", "criticism": "approved"}
+
+
+def test_public_answer_keeps_its_state_after_coalesced_events():
+    pipeline = EventPipeline(EventPolicy.named("production"), ["refiner"])
+    payloads = run(pipeline, loop_run()[:3])
+
+    assert [(p["author"], p["kind"]) for p in payloads] == [("planner", "internal"), ("critic", "internal"), ("refiner", "final")]
+    assert payloads[0]["state_delta"] == {"plan": "A"}
+    assert payloads[1]["state_delta"] == {"criticism": "too far"}
+    assert payloads[2]["state_delta"] == {"plan": "B"}
+
+
+def test_loop_answers_are_held_until_the_loop_ends():
+    pipeline = EventPipeline(EventPolicy.named("production"), ["refiner"], loop_authors=["critic", "refiner"])
+    payloads = run(pipeline, loop_run())
+
+    assert [(p["author"], p["kind"]) for p in payloads] == [("planner", "internal"), ("critic", "internal"), ("refiner", "final")]
+    assert payloads[1]["coalesced"] == 2 and payloads[1]["text"] == "approved"
+    assert payloads[2]["text"] == "plan B ok" and payloads[2]["state_delta"] == {"plan": "B ok"}
+    assert final_state(payloads) == {"plan": "B ok", "criticism": "approved"}
+    assert pipeline.stats == {"events": 5, "payloads": 3, "dropped": 2}
+
+
+def test_loop_answer_is_released_by_the_next_agent_outside_the_loop():
+    pipeline = EventPipeline(EventPolicy.named("minimal"), ["refiner", "writer"], loop_authors=["critic", "refiner"])
+    payloads = []
+    for e in loop_run() + [event("writer", "summary", {"summary": "done"})]:
+        payloads.append([p["author"] for p in pipeline.feed(e)])
+
+    assert payloads == [[], [], [], [], [], ["refiner", "writer"]]
+
+
+def test_debug_does_not_hold_loop_answers():
+    pipeline = EventPipeline(EventPolicy.named("debug"), ["refiner"], loop_authors=["critic", "refiner"])
+
+    assert len(run(pipeline, loop_run())) == 5
+
+
+def test_dropped_state_is_never_lost_or_overwritten_by_older_values():
+    pipeline = EventPipeline(EventPolicy.named("minimal"), ["writer"])
+    payloads = run(pipeline, [
+        event("a", "x", {"k": 1}),
+        event("b", "y", {"k": 2, "other": True}),
+        event("writer", "done", {"answer": 42}),
+    ])
+
+    assert payloads == [
+        {"id": None, "author": None, "kind": "state", "state_delta": {"k": 2, "other": True}},
+        {"id": "writer-done", "author": "writer", "kind": "final", "text": "done", "state_delta": {"answer": 42}},
+    ]
+
+
+def test_coalesced_keys_go_with_their_latest_writer():
+    pipeline = EventPipeline(EventPolicy.named("production"))
+    payloads = run(pipeline, [event("a", "1", {"k": 1}), event("b", "2", {"k": 2}), event("a", "3", {"k": 3})])
+
+    assert final_state(payloads) == {"k": 3}
+
+
+def test_sample_forwards_one_internal_event_in_n():
+    policy = EventPolicy(internal="sample", sample_every=3)
+    payloads = run(EventPipeline(policy), [event("a", str(i), {"i": i}) for i in range(7)])
+
+    assert [p.get("text") for p in payloads if p["kind"] == "internal"] == ["0", "3", "6"]
+    assert final_state(payloads) == {"i": 6}
+
+
+def test_unchanged_state_is_not_resent():
+    payloads = run(EventPipeline(EventPolicy.named("debug")), [event("a", "1", {"k": 1}), event("a", "2", {"k": 1})])
+
+    assert "state_delta" not in payloads[1]
+
+
+def test_partial_events_are_dropped_unless_forwarding_all():
+    events = [event("a", "par", partial=True, final=False), event("a", "full")]
+
+    assert len(run(EventPipeline(EventPolicy.named("production")), events)) == 1
+    assert len(run(EventPipeline(EventPolicy.named("debug")), events)) == 2
+
+
+def test_full_stream_sheds_internal_payloads_but_never_finals():
+    async def scenario():
+        stream = EventStream(EventPolicy(internal="all", max_queue=2))
+        for i in range(4):
+            await stream.put({"kind": "internal", "id": i})
+        put_final = asyncio.create_task(stream.put({"kind": "final", "id": "answer"}))
+        await asyncio.sleep(0)
+        assert not put_final.done()  # waits for the client instead of dropping
+        received = [await stream.__anext__()]
+        await put_final
+        await stream.close()  # does not wait for room in the full queue
+        received += [p async for p in stream]
+        return stream.dropped, received
+
+    dropped, received = asyncio.run(scenario())
+    assert dropped == 2
+    assert [p["id"] for p in received] == [0, 1, "answer"]
+
+
+def test_pump_events_streams_compacted_payloads_and_closes():
+    async def events():
+        for e in loop_run():
+            yield e
+
+    async def scenario():
+        stream = EventStream(EventPolicy.named("production"))
+        await pump_events(events(), stream, ["refiner"], ["critic", "refiner"])
+        compact = [p async for p in stream]
+        direct = [p async for p in stream_events(events(), EventPolicy.named("production"), ["refiner"], ["critic", "refiner"])]
+        return compact, direct
+
+    compact, direct = asyncio.run(scenario())
+    assert compact == direct
+    assert len(compact) == 3
+
+
+def test_cancelled_pump_does_not_block_on_a_full_stream_and_closes_the_run():
+    closed = asyncio.Event()
+
+    async def events():
+        try:
+            for i in range(100):
+                yield event(f"agent{i}", "step", {"i": i})
+        finally:
+            closed.set()
+
+    async def scenario():
+        stream = EventStream(EventPolicy(internal="all", max_queue=2, drop_when_full=False))
+        producer = asyncio.create_task(pump_events(events(), stream))
+        await asyncio.sleep(0.01)
+        assert not producer.done()  # blocked on the full queue: the client stopped reading
+        producer.cancel()
+        await asyncio.wait_for(asyncio.gather(producer, return_exceptions=True), 1.0)
+        return closed.is_set(), [p["author"] async for p in stream]
+
+    run_closed, drained = asyncio.run(scenario())
+    assert run_closed
+    assert drained == ["agent0", "agent1"]
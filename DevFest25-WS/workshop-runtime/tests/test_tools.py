@@ -0,0 +1,63 @@
+"""Tests for the tool executor (no ADK needed)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from workshop_runtime.tools import ToolExecutor
+
+
+def slow_tool(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(thread_workers=4, process_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_capped_tool_works_across_event_loops(executor):
+    tool = executor.offload(slow_tool, max_concurrency=2)
+
+    async def burst():
+        return await asyncio.gather(*(tool(0.01) for _ in range(4)))
+
+    # e.g. ADK's sync Runner.run(), which starts a new loop per call
+    assert asyncio.run(burst()) == [0.01] * 4
+    assert asyncio.run(burst()) == [0.01] * 4
+    assert executor.stats()["slow_tool"]["calls"] == 8
+
+
+def test_max_concurrency_limits_calls_in_flight(executor):
+    peak, running, lock = [0], [0], threading.Lock()
+
+    def tracked(seconds: float) -> float:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(seconds)
+        with lock:
+            running[0] -= 1
+        return seconds
+
+    tool = executor.offload(tracked, max_concurrency=2)
+
+    async def burst():
+        await asyncio.gather(*(tool(0.02) for _ in range(6)))
+
+    asyncio.run(burst())
+    stats = executor.stats()["tracked"]
+    assert peak[0] == 2
+    assert stats["max_queued"] >= 4 and stats["queued"] == 0 and stats["in_flight"] == 0
+
+
+def test_wrapped_tool_keeps_its_signature(executor):
+    tool = executor.offload(slow_tool)
+
+    assert tool.__name__ == "slow_tool"
+    assert asyncio.iscoroutinefunction(tool)
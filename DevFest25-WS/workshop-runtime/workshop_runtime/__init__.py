@@ -0,0 +1,19 @@
+"""
+Shared runtime helpers for the workshop agents (P1-P8).
+
+Each agent package depends on this one (see its pyproject.toml / requirements.txt),
+so performance and infrastructure code lives here once instead of in eight copies.
+"""
+
+from .config import Settings, get_settings
+from .tools import ToolExecutor, ToolStats, default_executor, offload, offload_tools
+
+__all__ = [
+    "Settings",
+    "get_settings",
+    "ToolExecutor",
+    "ToolStats",
+    "default_executor",
+    "offload",
+    "offload_tools",
+]
@@ -0,0 +1,338 @@
+"""
+Record/replay cassettes for model and tool traffic.
+
+A production run of P5/P7/P8 spends nearly all of its time waiting on Gemini and
+google_search, so its latency says little about our own orchestration (agent-tree
+traversal, state handling, event emission). In record mode an ADK plugin captures
+every model response and tool result, with timings, into a compact cassette
+(gzipped JSON lines). In replay mode the same plugin answers those calls from the
+cassette instead of the network, either at the recorded pace or as fast as
+possible, which leaves only orchestration time to measure.
+
+Enable it per deployment through settings:
+
+    WORKSHOP_CASSETTE_MODE=record  WORKSHOP_CASSETTE_PATH=p7.cassette.jsonl.gz  adk web
+    WORKSHOP_CASSETTE_MODE=replay  WORKSHOP_REPLAY_TIMING=fast                 adk web
+
+or benchmark a cassette offline (e.g. in CI) without a server:
+
+    python -m workshop_runtime.cassette bench P7-LoopAgents p7.cassette.jsonl.gz --repeat 20
+
+Model calls are matched by agent and request contents (ignoring generated
+function-call ids); if the request changed, the agent's next unused response is
+served instead and counted as a fallback (`bench` reports hits and fallbacks, so
+a replay that drifted from its recording is visible). With
+`WORKSHOP_REPLAY_STRICT=true` (or `bench --strict`) a fallback raises instead.
+Tool calls are matched the same way by tool name and arguments; a replayed tool
+is not run, but its recorded result and state writes are applied. `AgentTool`s
+(e.g. the P5 specialists) do run, so their sub-agents' model and tool calls are
+replayed one by one and their orchestration is measured. `google_search` runs
+inside the model call, so it is captured with it. A call with nothing left to
+replay raises `CassetteMiss` rather than reaching the network.
+
+Each session consumes recorded entries on its own, so several sessions (or the
+same conversation replayed twice) can be served from one cassette at once.
+
+Runs are recorded with their session, and `bench` replays the prompts of each
+recorded session in order in one session, so later turns see their history.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .config import get_settings
+
+MODES = ("off", "record", "replay")
+TIMINGS = ("recorded", "fast")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a call has no recorded answer."""
+
+
+def _strip_ids(value):
+    # Function-call ids are generated per run; leave them out of request keys.
+    if isinstance(value, dict):
+        return {k: _strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_ids(v) for v in value]
+    return value
+
+
+def _key(*parts) -> str:
+    canonical = json.dumps(_strip_ids(list(parts)), sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """An append-only list of recorded calls stored as gzipped JSON lines."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = []
+        self.hits = 0
+        self.fallbacks = 0
+        self._used = {}  # session id -> indexes of entries that session has consumed
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path) -> "Cassette":
+        cassette = cls(path)
+        with gzip.open(cassette.path, "rt", encoding="utf-8") as f:
+            cassette.entries = [json.loads(line) for line in f if line.strip()]
+        return cassette
+
+    def append(self, entry: dict):
+        with self._lock:
+            self.entries.append(entry)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Each append is its own gzip member, so a crash loses at most one entry.
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def take(self, kind: str, owner: str, key: str, strict: bool = False, session: str = "") -> dict:
+        """Returns the first entry matching `key` that `session` has not used, else the owner's next one.
+
+        With `strict`, a call whose request does not match any recording raises
+        `CassetteMiss` instead of falling back.
+        """
+        with self._lock:
+            used = self._used.setdefault(session, set())
+            fallback = None
+            for index, entry in enumerate(self.entries):
+                if index in used or entry["kind"] != kind or entry["owner"] != owner:
+                    continue
+                if entry["key"] == key:
+                    used.add(index)
+                    self.hits += 1
+                    return entry
+                if fallback is None:
+                    fallback = index
+            if fallback is None:
+                raise CassetteMiss(f"No recorded {kind} call left for {owner!r} in {self.path}")
+            if strict:
+                raise CassetteMiss(f"The {kind} call of {owner!r} does not match the recording in {self.path}")
+            used.add(fallback)
+            self.fallbacks += 1
+            return self.entries[fallback]
+
+    def rewind(self):
+        """Makes every entry available again, to all sessions."""
+        with self._lock:
+            self._used.clear()
+
+    def sessions(self) -> list:
+        """The recorded prompts grouped by session, in recording order."""
+        sessions = {}
+        for index, entry in enumerate(self.entries):
+            if entry["kind"] == "run":
+                # Cassettes recorded before sessions were stored: one session per run.
+                sessions.setdefault(entry.get("session", index), []).append(entry["prompt"])
+        return list(sessions.values())
+
+
+def cassette_plugin(mode: str, path, timing: str = "recorded", strict: bool = False):
+    """Builds the ADK plugin that records to, or replays from, the cassette at `path`."""
+    if mode not in ("record", "replay"):
+        raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+    if timing not in TIMINGS:
+        raise ValueError(f"Replay timing must be one of {TIMINGS}, got {timing!r}")
+
+    from google.adk.models.llm_response import LlmResponse
+    from google.adk.plugins.base_plugin import BasePlugin
+    from google.adk.tools.agent_tool import AgentTool
+
+    cassette = Cassette(path) if mode == "record" else Cassette.load(path)
+
+    def model_key(callback_context, llm_request):
+        contents = [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents]
+        system = llm_request.config.system_instruction if llm_request.config else None
+        return _key(callback_context.agent_name, contents, str(system))
+
+    class CassettePlugin(BasePlugin):
+        def __init__(self):
+            super().__init__(name="cassette")
+            self.cassette = cassette
+            self._calls = {"model_calls": 0, "tool_calls": 0}
+            self._started = {}
+
+        @property
+        def stats(self) -> dict:
+            """Calls seen, and in replay mode how many matched the recording exactly."""
+            return {**self._calls, "hits": cassette.hits, "fallbacks": cassette.fallbacks}
+
+        async def before_run_callback(self, *, invocation_context):
+            if mode == "record" and invocation_context.user_content:
+                prompt = "".join(p.text or "" for p in invocation_context.user_content.parts or [])
+                cassette.append({
+                    "kind": "run",
+                    "owner": invocation_context.agent.name,
+                    "key": "",
+                    "session": invocation_context.session.id,
+                    "prompt": prompt,
+                })
+            return None
+
+        async def before_model_callback(self, *, callback_context, llm_request):
+            self._calls["model_calls"] += 1
+            key = model_key(callback_context, llm_request)
+            if mode == "record":
+                self._started[(callback_context.invocation_id, callback_context.agent_name)] = (key, time.perf_counter())
+                return None
+            entry = cassette.take("model", callback_context.agent_name, key, strict, callback_context.session.id)
+            if timing == "recorded":
+                await asyncio.sleep(entry["seconds"])
+            response = LlmResponse.model_validate_json(json.dumps(entry["response"]))
+            for part in (response.content.parts if response.content else None) or []:
+                if part.function_call:
+                    part.function_call.id = None  # let ADK assign fresh ids for this run
+            return response
+
+        async def after_model_callback(self, *, callback_context, llm_response):
+            if mode != "record" or llm_response.partial:
+                return None
+            key, started = self._started.pop((callback_context.invocation_id, callback_context.agent_name), ("", time.perf_counter()))
+            cassette.append({
+                "kind": "model",
+                "owner": callback_context.agent_name,
+                "key": key,
+                "seconds": round(time.perf_counter() - started, 4),
+                "response": json.loads(llm_response.model_dump_json(exclude_none=True)),
+            })
+            return None
+
+        async def before_tool_callback(self, *, tool, tool_args, tool_context):
+            self._calls["tool_calls"] += 1
+            if isinstance(tool, AgentTool):
+                return None  # runs its agent; the calls inside are recorded and replayed
+            key = _key(tool.name, tool_args)
+            if mode == "record":
+                self._started[(tool_context.invocation_id, tool_context.function_call_id)] = (key, time.perf_counter())
+                return None
+            entry = cassette.take("tool", tool.name, key, strict, tool_context.session.id)
+            if timing == "recorded":
+                await asyncio.sleep(entry["seconds"])
+            for name, value in entry.get("state_delta", {}).items():
+                tool_context.state[name] = value
+            return entry["result"]
+
+        async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+            if mode != "record" or isinstance(tool, AgentTool):
+                return None
+            key, started = self._started.pop((tool_context.invocation_id, tool_context.function_call_id), ("", time.perf_counter()))
+            cassette.append({
+                "kind": "tool",
+                "owner": tool.name,
+                "key": key,
+                "seconds": round(time.perf_counter() - started, 4),
+                "result": json.loads(json.dumps(result, default=str)),
+                "state_delta": json.loads(json.dumps(tool_context.actions.state_delta, default=str)),
+            })
+            return None
+
+    return CassettePlugin()
+
+
+def cassette_plugins() -> list:
+    """The cassette plugin configured by settings, as a list (empty when off)."""
+    settings = get_settings()
+    if settings.cassette_mode == "off":
+        return []
+    return [cassette_plugin(settings.cassette_mode, settings.cassette_path, settings.replay_timing, settings.replay_strict)]
+
+
+async def bench(agent_dir, cassette_path, repeat: int = 5, timing: str = "fast", strict: bool = False) -> dict:
+    """Replays every recorded session of a cassette against an agent package, offline.
+
+    Each recorded session's prompts are sent in order within one session.
+    Returns wall-clock statistics per session; with "fast" timing they measure
+    only orchestration overhead (no model or tool latency). `hits` and
+    `fallbacks` count replayed calls that did and did not match the recording.
+    """
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    sys.path.insert(0, str(Path(agent_dir).resolve()))
+    import agent  # the workshop part's agent package
+
+    plugin = cassette_plugin("replay", cassette_path, timing, strict)
+    others = [p for p in getattr(getattr(agent, "app", None), "plugins", []) if p.name != "cassette"]
+    sessions = InMemorySessionService()
+    runner = Runner(app_name="agent", agent=agent.root_agent, session_service=sessions, plugins=[*others, plugin])
+
+    results = []
+    for prompts in plugin.cassette.sessions() or [[""]]:
+        timings, events = [], 0
+        for _ in range(repeat):
+            session = await sessions.create_session(app_name="agent", user_id="bench")
+            started = time.perf_counter()
+            events = 0
+            for prompt in prompts:
+                message = types.Content(role="user", parts=[types.Part(text=prompt)])
+                async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+                    events += 1
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append({
+            "prompts": prompts,
+            "events": events,
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "min_ms": round(min(timings), 2),
+            "max_ms": round(max(timings), 2),
+        })
+    recorded = sum(e.get("seconds", 0) for e in plugin.cassette.entries)
+    return {
+        "timing": timing,
+        "repeat": repeat,
+        "recorded_upstream_seconds": round(recorded, 3),
+        "hits": plugin.cassette.hits,
+        "fallbacks": plugin.cassette.fallbacks,
+        "runs": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m workshop_runtime.cassette", description="Inspect or benchmark cassettes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    show = commands.add_parser("show", help="summarize a cassette")
+    show.add_argument("cassette")
+
+    run = commands.add_parser("bench", help="replay a cassette's runs against an agent package")
+    run.add_argument("agent_dir", help="workshop part directory, e.g. P7-LoopAgents")
+    run.add_argument("cassette")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--timing", choices=TIMINGS, default="fast")
+    run.add_argument("--strict", action="store_true", help="fail on calls that do not match the recording")
+    run.add_argument("--json", help="also write the results to this file (for diffing in CI)")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        cassette = Cassette.load(args.cassette)
+        summary = {}
+        for entry in cassette.entries:
+            row = summary.setdefault((entry["kind"], entry["owner"]), [0, 0.0])
+            row[0] += 1
+            row[1] += entry.get("seconds", 0)
+        for (kind, owner), (count, seconds) in sorted(summary.items()):
+            print(f"{kind:<6} {owner:<28} {count:>4} calls {seconds:>8.2f}s")
+        return
+
+    report = asyncio.run(bench(args.agent_dir, args.cassette, args.repeat, args.timing, args.strict))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    if report["fallbacks"]:
+        print(f"⚠️  {report['fallbacks']} replayed call(s) did not match the recording", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
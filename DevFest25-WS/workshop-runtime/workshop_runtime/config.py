@@ -0,0 +1,151 @@
+"""
+Shared runtime configuration for the workshop agents.
+
+Every agent used to resolve the shared `.env`, call `load_dotenv`, print and check
+`GOOGLE_API_KEY` on import. `get_settings()` does that once per process and
+returns typed settings that agents and the runtime layers (tool pools, event
+compaction, ...) read, so tuning happens per deployment through environment
+variables instead of edits to eight `agent.py` files.
+
+The `.env` file is taken from `WORKSHOP_ENV_FILE` if set, otherwise from the
+current directory or the nearest parent that has one (running `adk web` inside
+`P1-ToolCalling/` finds `DevFest25-WS/.env`), and failing that from the nearest
+parent of this package (so `adk web DevFest25-WS/P1-ToolCalling` run from the
+repository root finds it too). Variables already set in the environment win over
+the file, as before.
+
+Settings and the variables that override them:
+
+    model                     WORKSHOP_MODEL               gemini-2.5-flash
+    http_timeout_seconds      WORKSHOP_HTTP_TIMEOUT        10
+    tool_thread_workers       WORKSHOP_TOOL_THREADS        16
+    tool_process_workers      WORKSHOP_TOOL_PROCESSES      2
+    tool_max_concurrency      WORKSHOP_TOOL_CONCURRENCY    8
+    event_policy              WORKSHOP_EVENT_POLICY        debug
+    upstream_slo_seconds      WORKSHOP_UPSTREAM_SLO        3         (slower upstream calls count as failures)
+    breaker_failures          WORKSHOP_BREAKER_FAILURES    3
+    breaker_cooldown_seconds  WORKSHOP_BREAKER_COOLDOWN    30
+    weather_fresh_seconds     WORKSHOP_WEATHER_FRESH       600
+    weather_refresh_seconds   WORKSHOP_WEATHER_REFRESH     120
+    weather_cache_size        WORKSHOP_WEATHER_CACHE_SIZE  256
+    cassette_mode             WORKSHOP_CASSETTE_MODE       off       (off | record | replay)
+    cassette_path             WORKSHOP_CASSETTE_PATH       agent.cassette.jsonl.gz
+    replay_timing             WORKSHOP_REPLAY_TIMING       recorded  (recorded | fast)
+    replay_strict             WORKSHOP_REPLAY_STRICT       false     (fail on calls that differ from the recording)
+    memory_path               WORKSHOP_MEMORY_PATH         agent.memory.jsonl
+    memory_index              WORKSHOP_MEMORY_INDEX        flat      (flat | ivf)
+    memory_top_k              WORKSHOP_MEMORY_TOP_K        5
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+def _find_env_file() -> Path | None:
+    explicit = os.getenv("WORKSHOP_ENV_FILE")
+    if explicit:
+        return Path(explicit)
+    cwd = Path.cwd()
+    here = Path(__file__).resolve().parent
+    for directory in dict.fromkeys((cwd, *cwd.parents, *here.parents)):
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_environment() -> Path | None:
+    """Loads the shared `.env` file (if any) and warns when no API key is set.
+
+    Returns the file that was loaded. Call `get_settings()` instead; this runs
+    once as part of it.
+    """
+    env_path = _find_env_file()
+    if env_path and env_path.exists():
+        load_dotenv(env_path)
+        print(f"✅ Loaded environment variables from {env_path}")
+    else:
+        print("ℹ️  No .env file found, using system environment variables")
+
+    if not os.getenv("GOOGLE_API_KEY"):
+        print("⚠️  WARNING: GOOGLE_API_KEY not found. Please set it via .env file or export command.")
+    return env_path
+
+
+def _env(name: str, default, cast=str):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {value!r}") from None
+
+
+def _flag(value: str) -> bool:
+    if value.strip().lower() in ("1", "true", "yes", "on"):
+        return True
+    if value.strip().lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Typed runtime settings shared by all agents on a worker."""
+    model: str = "gemini-2.5-flash"
+    http_timeout_seconds: float = 10.0
+    tool_thread_workers: int = 16
+    tool_process_workers: int = 2
+    tool_max_concurrency: int = 8
+    event_policy: str = "debug"
+    upstream_slo_seconds: float = 3.0
+    breaker_failures: int = 3
+    breaker_cooldown_seconds: float = 30.0
+    weather_fresh_seconds: float = 600.0
+    weather_refresh_seconds: float = 120.0
+    weather_cache_size: int = 256
+    cassette_mode: str = "off"
+    cassette_path: str = "agent.cassette.jsonl.gz"
+    replay_timing: str = "recorded"
+    replay_strict: bool = False
+    memory_path: str = "agent.memory.jsonl"
+    memory_index: str = "flat"
+    memory_top_k: int = 5
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Builds settings from `WORKSHOP_*` environment variables (see module docs)."""
+        defaults = cls()
+        return cls(
+            model=_env("WORKSHOP_MODEL", defaults.model),
+            http_timeout_seconds=_env("WORKSHOP_HTTP_TIMEOUT", defaults.http_timeout_seconds, float),
+            tool_thread_workers=_env("WORKSHOP_TOOL_THREADS", defaults.tool_thread_workers, int),
+            tool_process_workers=_env("WORKSHOP_TOOL_PROCESSES", defaults.tool_process_workers, int),
+            tool_max_concurrency=_env("WORKSHOP_TOOL_CONCURRENCY", defaults.tool_max_concurrency, int),
+            event_policy=_env("WORKSHOP_EVENT_POLICY", defaults.event_policy),
+            upstream_slo_seconds=_env("WORKSHOP_UPSTREAM_SLO", defaults.upstream_slo_seconds, float),
+            breaker_failures=_env("WORKSHOP_BREAKER_FAILURES", defaults.breaker_failures, int),
+            breaker_cooldown_seconds=_env("WORKSHOP_BREAKER_COOLDOWN", defaults.breaker_cooldown_seconds, float),
+            weather_fresh_seconds=_env("WORKSHOP_WEATHER_FRESH", defaults.weather_fresh_seconds, float),
+            weather_refresh_seconds=_env("WORKSHOP_WEATHER_REFRESH", defaults.weather_refresh_seconds, float),
+            weather_cache_size=_env("WORKSHOP_WEATHER_CACHE_SIZE", defaults.weather_cache_size, int),
+            cassette_mode=_env("WORKSHOP_CASSETTE_MODE", defaults.cassette_mode),
+            cassette_path=_env("WORKSHOP_CASSETTE_PATH", defaults.cassette_path),
+            replay_timing=_env("WORKSHOP_REPLAY_TIMING", defaults.replay_timing),
+            replay_strict=_env("WORKSHOP_REPLAY_STRICT", defaults.replay_strict, _flag),
+            memory_path=_env("WORKSHOP_MEMORY_PATH", defaults.memory_path),
+            memory_index=_env("WORKSHOP_MEMORY_INDEX", defaults.memory_index),
+            memory_top_k=_env("WORKSHOP_MEMORY_TOP_K", defaults.memory_top_k, int),
+        )
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Loads the environment once per process and returns the shared settings."""
+    load_environment()
+    return Settings.from_env()
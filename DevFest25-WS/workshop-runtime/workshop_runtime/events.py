@@ -0,0 +1,344 @@
+"""
+Event-stream compaction for workflow agents.
+
+Sequential, loop and parallel workflows (P6-P8) emit an event for every sub-agent
+step: each critic/refiner pass of a loop, every parallel branch. Clients usually
+only need the answer plus the state it produced, so forwarding everything makes
+the stream grow with iterations x branches.
+
+An `EventPolicy` says what to do with *internal* events (anything that is not a
+final response from one of the workflow's public authors):
+
+    all       forward every event (development default)
+    coalesce  keep only the latest event per internal author, sent at the next
+              public event or at the end of the run
+    sample    forward one internal event in every `sample_every`
+    drop      forward none
+
+State is sent as deltas: each payload carries only the keys whose value changed
+since the previous payload, including changes made by internal events that were
+coalesced or dropped, so clients never miss state.
+
+A public author inside a `LoopAgent` (P7's refiner) answers once per
+iteration; pass the loop's members as `loop_authors` and only its last answer is
+forwarded, when the loop ends.
+
+Two integrations are provided:
+
+* `stream_events()` wraps an ADK event iterator (e.g. `runner.run_async(...)`)
+  and yields compact payload dicts; `pump_events()` hands them to a slow client
+  through a bounded `EventStream` (backpressure). The warm server
+  (`workshop_runtime.warmup serve`, used by the container images) serves this as
+  `POST /compact/run_sse`.
+* `event_compaction_plugin()` builds an ADK plugin for `adk web`. ADK has already
+  stored the event when plugins see it, and yields every event, so the plugin can
+  only slim what is sent to the UI: internal events lose their content (state
+  deltas are kept) unless they are sampled in. It also carries the policy and
+  authors that `/compact/run_sse` uses for the agent.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from .config import get_settings
+
+INTERNAL_MODES = ("all", "coalesce", "sample", "drop")
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class EventPolicy:
+    """How internal workflow events are forwarded to clients."""
+    internal: str = "all"
+    sample_every: int = 5
+    max_queue: int = 64
+    drop_when_full: bool = True  # shed internal events instead of blocking on a full client queue
+
+    def __post_init__(self):
+        if self.internal not in INTERNAL_MODES:
+            raise ValueError(f"internal must be one of {INTERNAL_MODES}, got {self.internal!r}")
+
+    @classmethod
+    def named(cls, name: str) -> "EventPolicy":
+        """Preset policies: "debug" forwards everything, "production" coalesces."""
+        presets = {
+            "debug": cls(internal="all", drop_when_full=False),
+            "production": cls(internal="coalesce"),
+            "minimal": cls(internal="drop"),
+        }
+        if name not in presets:
+            raise ValueError(f"Unknown event policy {name!r}. Choose from: {', '.join(presets)}")
+        return presets[name]
+
+    @classmethod
+    def from_settings(cls) -> "EventPolicy":
+        """The preset named by the `event_policy` setting (`WORKSHOP_EVENT_POLICY`)."""
+        return cls.named(get_settings().event_policy)
+
+
+def _text(event) -> str:
+    content = getattr(event, "content", None)
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if getattr(part, "text", None))
+
+
+def _tool_calls(event) -> list:
+    content = getattr(event, "content", None)
+    if not content or not content.parts:
+        return []
+    return [part.function_call.name for part in content.parts if getattr(part, "function_call", None)]
+
+
+def _state_delta(event) -> dict:
+    actions = getattr(event, "actions", None)
+    return dict(actions.state_delta) if actions and actions.state_delta else {}
+
+
+@dataclass
+class _Pending:
+    """Events held back for one author: coalesced internal passes, or a loop's latest answer."""
+    id: str
+    author: str
+    kind: str = "internal"
+    text: str = ""
+    tools: list = field(default_factory=list)
+    delta: dict = field(default_factory=dict)
+    count: int = 0
+
+
+class EventPipeline:
+    """Turns ADK events into compact client payloads according to a policy.
+
+    Args:
+        policy: What to do with internal events.
+        public_authors: Agents whose final responses are the workflow's answer and
+            are always forwarded. Everything else is internal.
+        loop_authors: Sub-agents of a `LoopAgent`. A public author among them
+            answers once per iteration; unless the policy is "all", only its last
+            answer is forwarded, when the loop ends (the next event from outside
+            the loop, or the end of the run).
+    """
+
+    def __init__(self, policy: EventPolicy, public_authors=(), loop_authors=()):
+        self.policy = policy
+        self.public_authors = frozenset(public_authors) | {"user"}
+        self.loop_authors = frozenset(loop_authors)
+        self.stats = {"events": 0, "payloads": 0, "dropped": 0}
+        self._pending = {}  # (kind, author) -> _Pending, least recently updated first
+        self._sent_state = {}
+        self._unsent_delta = {}  # from dropped events, sent with the next payload
+        self._internal_seen = 0
+
+    def is_internal(self, event) -> bool:
+        if event.author not in self.public_authors:
+            return True
+        return event.author != "user" and not event.is_final_response()
+
+    def feed(self, event) -> list:
+        """Processes one event; returns the payloads to send now (possibly none)."""
+        self.stats["events"] += 1
+        delta = _state_delta(event)
+        mode = self.policy.internal
+        payloads = []
+        if event.author not in self.loop_authors and any(p.kind == "final" for p in self._pending.values()):
+            payloads = self.flush()  # the loop is over: release its last answer
+
+        if not self.is_internal(event):
+            if event.author in self.loop_authors and mode != "all":
+                self._hold(event, "final", delta)
+                return payloads
+            # Coalesced events go out first, so the answer carries only its own state changes.
+            payloads += self.flush()
+            return payloads + [self._payload(event.id, event.author, "final", _text(event), _tool_calls(event), delta)]
+
+        if getattr(event, "partial", False) and mode != "all":
+            self.stats["dropped"] += 1
+            self._claim(delta, self._unsent_delta)
+            return payloads
+
+        if mode == "coalesce":
+            self._hold(event, "internal", delta)
+            return payloads
+
+        self._internal_seen += 1
+        if mode == "all" or (mode == "sample" and self._internal_seen % self.policy.sample_every == 1):
+            return payloads + [self._payload(event.id, event.author, "internal", _text(event), _tool_calls(event), delta)]
+        self.stats["dropped"] += 1
+        self._claim(delta, self._unsent_delta)
+        return payloads
+
+    def flush(self) -> list:
+        """Emits held events (and any unsent state) as payloads."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        payloads = [self._payload(p.id, p.author, p.kind, p.text, p.tools, p.delta, coalesced=p.count) for p in pending]
+        self.stats["dropped"] += sum(p.count - 1 for p in pending)
+        if any(self._sent_state.get(k, _MISSING) != v for k, v in self._unsent_delta.items()):
+            payloads.append(self._payload(None, None, "state", "", []))
+        self._unsent_delta.clear()
+        return payloads
+
+    def _claim(self, delta: dict, target: dict):
+        # Each unsent key stays only with its latest writer, so held payloads can be
+        # emitted in any order without an older value overwriting a newer one.
+        for key in delta:
+            self._unsent_delta.pop(key, None)
+            for pending in self._pending.values():
+                pending.delta.pop(key, None)
+        target.update(delta)
+
+    def _hold(self, event, kind: str, delta: dict):
+        pending = self._pending.pop((kind, event.author), None) or _Pending(id=event.id, author=event.author, kind=kind)
+        self._pending[(kind, event.author)] = pending
+        text, tools = _text(event), _tool_calls(event)
+        pending.id = event.id
+        if kind == "final":  # a newer answer replaces the previous one
+            pending.text, pending.tools = text, tools
+        else:
+            pending.text, pending.tools = text or pending.text, pending.tools + tools
+        pending.count += 1
+        self._claim(delta, pending.delta)
+
+    def _payload(self, event_id, author, kind, text, tools, delta=None, coalesced=1) -> dict:
+        own = {}
+        self._claim(delta or {}, own)
+        merged = {**self._unsent_delta, **own}
+        self._unsent_delta.clear()
+        changed = {k: v for k, v in merged.items() if self._sent_state.get(k, _MISSING) != v}
+        self._sent_state.update(changed)
+        self.stats["payloads"] += 1
+        payload = {"id": event_id, "author": author, "kind": kind}
+        if text:
+            payload["text"] = text
+        if tools:
+            payload["tools"] = tools
+        if changed:
+            payload["state_delta"] = changed
+        if coalesced > 1:
+            payload["coalesced"] = coalesced
+        return payload
+
+
+class EventStream:
+    """Bounded per-client queue of payloads.
+
+    `put()` waits while the client is `max_queue` payloads behind, which slows the
+    producer down to the client's pace. With `drop_when_full`, internal payloads
+    are shed instead of waiting; final answers are never dropped. `close()` never
+    waits: the client reads what is queued and then stops, and a producer cancelled
+    because the client went away is not left blocked on a full queue.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, policy: EventPolicy):
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._queue = asyncio.Queue(maxsize=policy.max_queue)
+
+    async def put(self, payload: dict):
+        if self._queue.full() and self.policy.drop_when_full and payload["kind"] != "final":
+            self.dropped += 1
+            return
+        await self._queue.put(payload)
+
+    async def close(self):
+        self.closed = True
+        try:
+            self._queue.put_nowait(self._CLOSED)  # wakes a client waiting on an empty queue
+        except asyncio.QueueFull:
+            pass  # the client sees `closed` once it has drained the queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        payload = await self._queue.get()
+        if payload is self._CLOSED:
+            raise StopAsyncIteration
+        return payload
+
+
+async def stream_events(events, policy: EventPolicy, public_authors=(), loop_authors=()):
+    """Compacts an async iterator of ADK events into payload dicts."""
+    pipeline = EventPipeline(policy, public_authors, loop_authors)
+    async for event in events:
+        for payload in pipeline.feed(event):
+            yield payload
+    for payload in pipeline.flush():
+        yield payload
+
+
+async def pump_events(events, stream: EventStream, public_authors=(), loop_authors=()):
+    """Feeds compacted payloads into `stream` (with backpressure), then closes it.
+
+    When cancelled (the client went away), `events` is closed as well, so the run
+    that produces them stops instead of being kept alive by the pending task.
+    """
+    payloads = stream_events(events, stream.policy, public_authors, loop_authors)
+    try:
+        async for payload in payloads:
+            await stream.put(payload)
+    finally:
+        await stream.close()
+        await payloads.aclose()
+        if hasattr(events, "aclose"):
+            await events.aclose()
+
+
+def loop_members(agent) -> list:
+    """Names of all agents that run inside a `LoopAgent` in `agent`'s tree."""
+    from google.adk.agents import LoopAgent
+
+    def descendants(node):
+        for child in node.sub_agents or []:
+            yield child
+            yield from descendants(child)
+
+    members, stack = [], [agent]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, LoopAgent):
+            members += [child.name for child in descendants(node)]
+        else:
+            stack.extend(node.sub_agents or [])
+    return members
+
+
+def event_compaction_plugin(policy: EventPolicy, public_authors=(), loop_authors=()):
+    """Builds an ADK plugin that slims internal events sent to `adk web` clients.
+
+    Internal events keep their id, author and actions (state deltas, escalation)
+    but drop their content. "sample" lets one in every `sample_every` through
+    untouched; "all" leaves every event untouched.
+
+    ADK yields every event a plugin sees, so the plugin cannot drop, coalesce or
+    hold events back; the event count stays iterations x branches. Clients that
+    want fewer events use the `/compact/run_sse` endpoint of the warm server
+    (`workshop_runtime.warmup`), which runs the full `EventPipeline` with the
+    policy and authors configured here.
+    """
+    from google.adk.plugins.base_plugin import BasePlugin
+
+    class EventCompactionPlugin(BasePlugin):
+        def __init__(self):
+            super().__init__(name="event_compaction")
+            self.policy = policy
+            self.public_authors = tuple(public_authors)
+            self.loop_authors = tuple(loop_authors)
+            self.pipeline = EventPipeline(policy, public_authors, loop_authors)
+            self.internal_seen = 0
+
+        async def on_event_callback(self, *, invocation_context, event):
+            if policy.internal == "all" or not self.pipeline.is_internal(event):
+                return None
+            self.internal_seen += 1
+            if policy.internal == "sample" and self.internal_seen % policy.sample_every == 1:
+                return None
+            return event.model_copy(update={"content": None})
+
+    return EventCompactionPlugin()
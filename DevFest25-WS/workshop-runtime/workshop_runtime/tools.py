@@ -0,0 +1,195 @@
+"""
+Async execution layer for custom function tools.
+
+ADK runs agents inside an asyncio event loop. A plain (synchronous) function tool
+is called directly on that loop, so a slow tool — a blocking HTTP request, a big
+computation — freezes every other session served by the same worker until it
+returns.
+
+`offload()` turns a synchronous tool into an async one that runs in a bounded
+thread pool (or a process pool for CPU-heavy tools). The wrapper keeps the
+original name, signature and docstring, so ADK builds the same tool declaration
+for the model. Each tool also gets an optional concurrency cap and counters for
+calls, in-flight work and queue depth:
+
+    from workshop_runtime import get_settings, offload
+
+    root_agent = Agent(
+        ...,
+        tools=[offload(get_live_weather_forecast, max_concurrency=get_settings().tool_max_concurrency)],
+    )
+
+Wrap tools where they are registered (as above) rather than with `@offload` on
+the definition: process-pool tools are pickled by their module-level name, which
+must still point at the original function.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from .config import get_settings
+
+
+@dataclass
+class ToolStats:
+    """Counters for one offloaded tool."""
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class ToolExecutor:
+    """Runs synchronous tools off the event loop with per-tool limits and metrics.
+
+    The thread and process pools are created on first use, so an executor that
+    only ever sees async tools costs nothing.
+    """
+
+    def __init__(self, thread_workers: int, process_workers: int):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self._threads = None
+        self._processes = None
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, cpu_bound: bool):
+        with self._lock:
+            if cpu_bound:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="tool")
+            return self._threads
+
+    def offload(self, func, *, max_concurrency: int | None = None, cpu_bound: bool = False):
+        """Returns an async version of `func` that runs in this executor's pools.
+
+        Args:
+            func: The tool function. Async tools are returned unchanged unless a
+                concurrency cap is requested.
+            max_concurrency: Maximum concurrent calls of this tool per event loop
+                (one per worker under `adk web`); further calls wait (and are
+                counted as queued). None means no cap beyond the pool size.
+            cpu_bound: Run in the process pool instead of the thread pool. The
+                function and its arguments must be picklable.
+        """
+        is_async = inspect.iscoroutinefunction(func)
+        if is_async and max_concurrency is None:
+            return func
+
+        stats = self._stats.setdefault(func.__name__, ToolStats())
+        # An asyncio.Semaphore binds to the loop it is first used on, and the sync
+        # Runner.run() starts a new loop per call, so keep one per running loop.
+        semaphores = weakref.WeakKeyDictionary()
+
+        def semaphore():
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                if loop not in semaphores:
+                    semaphores[loop] = asyncio.Semaphore(max_concurrency)
+                return semaphores[loop]
+
+        async def call(*args, **kwargs):
+            if is_async:
+                return await func(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            if cpu_bound:
+                job = functools.partial(func, *args, **kwargs)
+            else:
+                # Like asyncio.to_thread: keep context variables visible to the tool.
+                job = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+            return await loop.run_in_executor(self._pool(cpu_bound), job)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            limit = semaphore() if max_concurrency else None
+            stats.queued += 1
+            stats.max_queued = max(stats.max_queued, stats.queued)
+            if limit is not None:
+                await limit.acquire()
+            stats.queued -= 1
+            stats.in_flight += 1
+            started = time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+                stats.calls += 1
+                stats.total_seconds += time.perf_counter() - started
+                if limit is not None:
+                    limit.release()
+
+        return wrapper
+
+    def offload_tools(self, tools, **options):
+        """Offloads every synchronous plain-function tool in `tools`.
+
+        Built-in tools (google_search), AgentTools and async functions pass
+        through unchanged, so this can wrap an agent's whole tool list.
+        """
+        return [
+            self.offload(tool, **options)
+            if inspect.isfunction(tool) and not inspect.iscoroutinefunction(tool)
+            else tool
+            for tool in tools
+        ]
+
+    def stats(self) -> dict:
+        """Snapshot of per-tool counters, keyed by tool name."""
+        return {name: {**asdict(s), "mean_seconds": s.mean_seconds} for name, s in self._stats.items()}
+
+    def prestart(self):
+        """Creates the thread pool and starts all of its workers now, not on first use."""
+        pool = self._pool(cpu_bound=False)
+        # Workers that block on a shared barrier force the pool to spawn every thread.
+        barrier = threading.Barrier(self.thread_workers)
+        for future in [pool.submit(barrier.wait, 10) for _ in range(self.thread_workers)]:
+            future.result()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=wait)
+            self._threads = self._processes = None
+
+
+_default = None
+
+
+def default_executor() -> ToolExecutor:
+    """The process-wide executor shared by all agents on this worker, sized from settings."""
+    global _default
+    if _default is None:
+        settings = get_settings()
+        _default = ToolExecutor(settings.tool_thread_workers, settings.tool_process_workers)
+    return _default
+
+
+def offload(func, **options):
+    """`ToolExecutor.offload` on the default executor."""
+    return default_executor().offload(func, **options)
+
+
+def offload_tools(tools, **options):
+    """`ToolExecutor.offload_tools` on the default executor."""
+    return default_executor().offload_tools(tools, **options)
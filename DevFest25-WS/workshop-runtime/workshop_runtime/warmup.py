@@ -0,0 +1,276 @@
+"""
+Warm start and health-gated readiness for the agent containers.
+
+`adk web` starts cold: the first request imports the agent (and with it ADK and
+google-genai), builds a model client, opens HTTPS connections and loads caches
+such as the P2 gazetteer, so the first user after a scale-up waits for all of
+it. `serve` runs the same ADK web app but does that work in a startup phase, and
+only then reports ready:
+
+    /healthz   200 as soon as the process serves HTTP (liveness)
+    /readyz    503 while warming up, 200 once warm (point the startup probe here)
+    /statz     per-tool counters of the shared tool executor (calls, errors,
+               in-flight and queued calls, queue-depth high-water mark, timings)
+
+It also serves `POST /compact/run_sse`: the agent run as a compacted event
+stream (see `workshop_runtime.events`), for clients that want the workflow's
+answer and state rather than every sub-agent step.
+
+Warm-up steps, each timed in the /readyz response:
+
+1. import   - import the agent package (ADK, google-genai, tools, settings)
+2. models   - give all agents in the tree one shared model object per model
+              name, so they reuse one pooled genai client, and create it
+3. tools    - start the workers of the shared tool thread pool
+4. agent    - run the agent package's optional `warmup()` hook (indexes,
+              caches, HTTP sessions)
+5. connect  - open the HTTPS connection to the Gemini API (best effort: a
+              failure is reported but does not block readiness)
+
+`precompute` is the build-time half. It byte-compiles the agent and runtime and
+imports the agent once, so the image ships .pyc files and an import error fails
+the build instead of the first request:
+
+    RUN .venv/bin/python -m workshop_runtime.warmup precompute
+    CMD [".venv/bin/python", "-m", "workshop_runtime.warmup", "serve", "--host", "0.0.0.0", "--port", "8000"]
+"""
+
+import argparse
+import asyncio
+import compileall
+import contextlib
+import importlib
+import inspect
+import json
+import sys
+import time
+from pathlib import Path
+
+from .config import get_settings
+from .events import EventPolicy, EventStream, loop_members, pump_events
+from .tools import default_executor
+
+AGENT_PACKAGE = "agent"
+
+
+def load_agent_package(agents_dir):
+    """Imports the workshop part's `agent` package the way `adk web` does."""
+    path = str(Path(agents_dir).resolve())
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(AGENT_PACKAGE)
+
+
+def _agent_tree(agent):
+    # Sub-agents and agents wrapped in AgentTools (e.g. the google_search specialists).
+    seen, stack = set(), [agent]
+    while stack:
+        agent = stack.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        yield agent
+        stack.extend(getattr(agent, "sub_agents", None) or [])
+        stack.extend(tool.agent for tool in getattr(agent, "tools", None) or [] if hasattr(tool, "agent"))
+
+
+def share_models(root_agent) -> dict:
+    """Replaces model names in the agent tree with one shared model object per name.
+
+    ADK otherwise builds a new model object (and genai client) from the name on
+    every call. Returns the shared models by name, with their clients created.
+    """
+    from google.adk.models.registry import LLMRegistry
+
+    shared = {}
+    for agent in _agent_tree(root_agent):
+        model = getattr(agent, "model", None)
+        if isinstance(model, str) and model:
+            if model not in shared:
+                shared[model] = LLMRegistry.new_llm(model)
+            agent.model = shared[model]
+    for llm in shared.values():
+        getattr(llm, "api_client", None)  # cached property: creates the pooled client
+    return shared
+
+
+class Warmup:
+    """Runs the warm-up steps once and reports progress for the readiness probe."""
+
+    def __init__(self, agents_dir):
+        self.agents_dir = agents_dir
+        self.state = "starting"
+        self.steps = {}
+        self.error = None
+        self.models = {}
+        self.package = None
+
+    def report(self) -> dict:
+        report = {"state": self.state, "steps": self.steps}
+        if self.error:
+            report["error"] = self.error
+        return report
+
+    async def _step(self, name, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        self.steps[name] = round(time.perf_counter() - started, 3)
+        return result
+
+    async def _connect(self):
+        timeout = get_settings().http_timeout_seconds
+        for name, llm in self.models.items():
+            client = getattr(llm, "api_client", None)
+            if client is not None:
+                await asyncio.wait_for(client.aio.models.get(model=name), timeout)
+
+    async def run(self):
+        try:
+            package = self.package = await self._step("import", asyncio.to_thread, load_agent_package, self.agents_dir)
+            self.models = await self._step("models", asyncio.to_thread, share_models, package.root_agent)
+            await self._step("tools", asyncio.to_thread, default_executor().prestart)
+            hook = getattr(package, "warmup", None)
+            if hook is not None:
+                await self._step("agent", asyncio.to_thread, hook)
+        except Exception as e:
+            self.state, self.error = "failed", f"{type(e).__name__}: {e}"
+            print(f"❌ Warm-up failed, staying unready: {self.error}")
+            return
+        try:
+            await self._step("connect", self._connect)
+        except Exception as e:
+            self.steps["connect"] = f"skipped ({type(e).__name__})"
+            print(f"⚠️  Could not pre-connect to the model API: {e}")
+        self.state = "ready"
+        print(f"✅ Warm and ready: {self.steps}")
+
+
+def _compact_runner(package):
+    """A runner for /compact/run_sse, with the agent's compaction settings.
+
+    Uses the agent's plugins except content slimming, which the pipeline replaces.
+    """
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+    plugins = list(getattr(getattr(package, "app", None), "plugins", []))
+    compaction = next((plugin for plugin in plugins if plugin.name == "event_compaction"), None)
+    runner = Runner(
+        app_name="agent",
+        agent=package.root_agent,
+        session_service=InMemorySessionService(),
+        plugins=[plugin for plugin in plugins if plugin is not compaction],
+    )
+    if compaction is not None:
+        return runner, compaction.policy, compaction.public_authors, compaction.loop_authors
+    return runner, EventPolicy.from_settings(), (), loop_members(package.root_agent)
+
+
+def create_app(agents_dir=".", host: str = "127.0.0.1", port: int = 8000):
+    """The `adk web` FastAPI app with a warm-up phase and /healthz, /readyz, /statz."""
+    from fastapi import Body
+    from fastapi.responses import JSONResponse, StreamingResponse
+    from google.adk.cli.fast_api import get_fast_api_app
+    from google.genai import types
+
+    warmup = Warmup(agents_dir)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        # Warm up in the background so /healthz answers while the probe waits on /readyz.
+        task = asyncio.create_task(warmup.run())
+        yield
+        task.cancel()
+
+    app = get_fast_api_app(
+        agents_dir=str(Path(agents_dir).resolve()), web=True, host=host, port=port, lifespan=lifespan
+    )
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "ok"}
+
+    @app.get("/readyz")
+    async def readyz():
+        return JSONResponse(warmup.report(), status_code=200 if warmup.state == "ready" else 503)
+
+    @app.get("/statz")
+    async def statz():
+        return {"tools": default_executor().stats()}
+
+    compact = {}
+
+    @app.post("/compact/run_sse")
+    async def compact_run_sse(body: dict = Body(...)):
+        """Runs the agent on `message` and streams compacted payloads as server-sent events.
+
+        Body: {"message": str, "user_id": str (default "user"), "session_id": str (optional)}.
+        The session id is returned in the X-Session-Id header; pass it back to continue.
+        """
+        if warmup.state != "ready":
+            return JSONResponse(warmup.report(), status_code=503)
+        if "runner" not in compact:
+            compact["runner"], compact["policy"], compact["public"], compact["loop"] = _compact_runner(warmup.package)
+        sessions = compact["runner"].session_service
+        user_id = body.get("user_id", "user")
+        session = None
+        if body.get("session_id"):
+            session = await sessions.get_session(app_name="agent", user_id=user_id, session_id=body["session_id"])
+        if session is None:
+            session = await sessions.create_session(app_name="agent", user_id=user_id)
+
+        message = types.Content(role="user", parts=[types.Part(text=body.get("message", ""))])
+        events = compact["runner"].run_async(user_id=user_id, session_id=session.id, new_message=message)
+        stream = EventStream(compact["policy"])
+        producer = asyncio.create_task(pump_events(events, stream, compact["public"], compact["loop"]))
+
+        async def sse():
+            try:
+                async for payload in stream:
+                    yield f"data: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+            finally:
+                producer.cancel()
+
+        return StreamingResponse(sse(), media_type="text/event-stream", headers={"X-Session-Id": session.id})
+
+    app.state.warmup = warmup
+    return app
+
+
+def precompute(agents_dir="."):
+    """Build-time step: byte-compiles the agent and the runtime, then imports the agent."""
+    agents_dir = Path(agents_dir).resolve()
+    for directory in (agents_dir / AGENT_PACKAGE, Path(__file__).parent):
+        if not compileall.compile_dir(directory, quiet=1):
+            raise SystemExit(f"❌ Byte-compilation failed in {directory}")
+    started = time.perf_counter()
+    load_agent_package(agents_dir)
+    print(f"✅ Precompiled and imported {agents_dir / AGENT_PACKAGE} ({time.perf_counter() - started:.1f}s import)")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m workshop_runtime.warmup", description="Warm starts for agent containers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("precompute", help="byte-compile and import the agent (run at image build time)")
+    build.add_argument("agents_dir", nargs="?", default=".")
+
+    run = commands.add_parser("serve", help="serve the ADK web UI/API after a warm-up phase")
+    run.add_argument("agents_dir", nargs="?", default=".")
+    run.add_argument("--host", default="127.0.0.1")
+    run.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.command == "precompute":
+        precompute(args.agents_dir)
+        return
+
+    import uvicorn
+
+    uvicorn.run(create_app(args.agents_dir, args.host, args.port), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()